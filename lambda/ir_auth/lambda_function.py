@@ -2,29 +2,76 @@ import json
 import urllib.request
 import urllib.parse
 import urllib.error
-import boto3
+import urllib3
 import hashlib
 import base64
 import time
 import logging
 import os
-from typing import Dict, Any, Optional
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Tuple
+from botocore.config import Config
 from botocore.exceptions import ClientError
 
+try:
+    import orjson
+except ImportError:  # Optional: only present when shipped in the deployment package or a layer
+    orjson = None
+
 # Configure structured logging
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
-# Initialize AWS clients
-dynamodb = boto3.client('dynamodb')
-secrets_client = boto3.client('secretsmanager')
+# AWS client config with tight timeouts so a slow DynamoDB call cannot stall authentication
+dynamodb_config = Config(
+    region_name=os.environ.get('AWS_REGION'),
+    connect_timeout=1,
+    read_timeout=2,
+    retries={'mode': 'standard', 'max_attempts': 2},
+    tcp_keepalive=True
+)
+
+# Created on first use; importing boto3 and loading its service model is the bulk of cold start
+dynamodb = None
+
+# Reused across warm invocations so the OAuth TLS connection is not re-established each time
+http_pool = urllib3.PoolManager(
+    num_pools=1,
+    maxsize=4,
+    retries=False,
+    timeout=urllib3.Timeout(connect=3, read=27)
+)
 
 # Constants
 OAUTH_TOKEN_URL = "https://oauth.iracing.com/oauth2/token"
+SECRETS_EXTENSION_URL = "http://localhost:{port}/secretsmanager/get?secretId={secret_id}"
+SECRETS_EXTENSION_TIMEOUT = 1  # seconds
+CREDENTIALS_CACHE_TTL = 300  # seconds; no longer than the extension's secretsManagerTtl, so a rotated password is picked up
 ACCESS_TOKEN_LIFETIME = 600  # 10 minutes
 REFRESH_TOKEN_LIFETIME = 7 * 24 * 60 * 60  # 7 days
 MAX_RETRIES = 3
 BASE_BACKOFF_DELAY = 1  # seconds
+TOKEN_CACHE_MARGIN = 60  # seconds of remaining lifetime required to serve a token; closer to expiry it is refreshed
+INFLIGHT_WAIT_TIMEOUT = 15  # seconds to wait on another caller's token refresh
+DEADLINE_SAFETY_MARGIN = 2  # seconds reserved after OAuth retries for storing tokens and responding
+MIN_ATTEMPT_TIME = 3  # seconds an OAuth attempt needs to be worth starting
+BATCH_GET_LIMIT = 100  # keys per BatchGetItem request
+BATCH_WRITE_LIMIT = 25  # puts per BatchWriteItem request
+BATCH_MAX_RETRIES = 3  # passes over unprocessed batch keys/items before giving up
+BATCH_MAX_WORKERS = 4  # concurrent OAuth requests, matching the HTTP pool size
+TOKEN_PROJECTION = ('#ttl, access_token, token_type, expires_in, #scope, '
+                    'refresh_token, refresh_token_ttl, refresh_token_expires_in')
+TOKEN_PROJECTION_NAMES = {'#ttl': 'ttl', '#scope': 'scope'}
+REFRESH_TOKEN_ATTRIBUTES = ('refresh_token', 'refresh_token_expires_in', 'refresh_token_ttl')
+
+# Module-level caches reused across warm invocations of the same sandbox
+_CREDS_CACHE: Dict[str, Any] = {'value': None, 'expires': 0.0}
+_TOKEN_CACHE: Optional[Tuple[Dict[str, Any], int]] = None
+
+# Guards the per-username map of in-flight refresh/password grants
+_refresh_lock = threading.Lock()
+_inflight: Dict[str, threading.Event] = {}
 
 class AuthenticationError(Exception):
     """Custom exception for authentication failures"""
@@ -34,31 +81,110 @@ class RateLimitError(Exception):
     """Custom exception for rate limiting"""
     pass
 
+def json_loads(data: bytes) -> Any:
+    """
+    Parse a JSON document, using orjson when it is available
+    
+    Args:
+        data: Raw JSON bytes
+        
+    Returns:
+        Parsed JSON value
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def json_dumps(value: Any) -> str:
+    """
+    Serialize a value to a JSON string, using orjson when it is available
+    
+    Args:
+        value: Value to serialize
+        
+    Returns:
+        JSON string
+    """
+    if orjson is not None:
+        return orjson.dumps(value).decode('utf-8')
+    return json.dumps(value)
+
+def get_dynamodb_client():
+    """
+    Return the DynamoDB client, importing boto3 and creating it on first use
+    
+    Returns:
+        boto3 DynamoDB client
+    """
+    global dynamodb
+    if dynamodb is None:
+        import boto3
+        dynamodb = boto3.client('dynamodb', config=dynamodb_config)
+    return dynamodb
+
 def get_oauth_credentials() -> Dict[str, str]:
     """
-    Retrieve OAuth credentials from Secrets Manager
+    Retrieve OAuth credentials through the AWS Parameters and Secrets Lambda Extension
+    
+    The extension serves the secret from its local in-memory cache, so warm reads
+    are a loopback HTTP call instead of a signed Secrets Manager API request. The
+    decoded credentials are reused for CREDENTIALS_CACHE_TTL on top of that.
     
     Returns:
-        Dict containing client_id, client_secret, username, password
+        Dict containing client_id, client_secret, username, password, their
+        precomputed masked forms (_masked_client_secret, _masked_password) and
+        the encoded grant bodies (_password_body, _refresh_body_prefix)
         
     Raises:
-        ClientError: If secret retrieval fails
+        urllib.error.URLError: If the extension cannot be reached or returns an error
     """
+    if _CREDS_CACHE['value'] is not None and time.monotonic() < _CREDS_CACHE['expires']:
+        return _CREDS_CACHE['value']
+    
     try:
         secret_name = os.environ.get('IRACING_SECRET_NAME', 'iracing-oauth-credentials')
-        response = secrets_client.get_secret_value(SecretId=secret_name)
-        credentials = json.loads(response['SecretString'])
+        url = SECRETS_EXTENSION_URL.format(
+            port=os.environ.get('PARAMETERS_SECRETS_EXTENSION_HTTP_PORT', '2773'),
+            secret_id=urllib.parse.quote(secret_name, safe='')
+        )
+        req = urllib.request.Request(
+            url,
+            headers={'X-Aws-Parameters-Secrets-Token': os.environ.get('AWS_SESSION_TOKEN', '')}
+        )
+        with urllib.request.urlopen(req, timeout=SECRETS_EXTENSION_TIMEOUT) as response:
+            # json_loads takes bytes, so skip the separate UTF-8 decode
+            secret = json_loads(response.read())
+        credentials = json_loads(secret['SecretString'])
         
         required_keys = ['client_id', 'client_secret', 'username', 'password']
         for key in required_keys:
             if key not in credentials:
                 raise ValueError(f"Missing required credential: {key}")
                 
-        logger.info("Successfully retrieved OAuth credentials from Secrets Manager")
+        # The masked values and form bodies only depend on the credentials, so build them once per load
+        credentials['_masked_client_secret'] = mask_client_secret(credentials['client_secret'], credentials['client_id'])
+        credentials['_masked_password'] = mask_password(credentials['password'], credentials['username'])
+        credentials['_password_body'] = urllib.parse.urlencode({
+            'grant_type': 'password_limited',
+            'client_id': credentials['client_id'],
+            'client_secret': credentials['_masked_client_secret'],
+            'username': credentials['username'],
+            'password': credentials['_masked_password'],
+            'scope': 'iracing.auth'
+        }).encode('ascii')
+        credentials['_refresh_body_prefix'] = (urllib.parse.urlencode({
+            'grant_type': 'refresh_token',
+            'client_id': credentials['client_id'],
+            'client_secret': credentials['_masked_client_secret']
+        }) + '&refresh_token=').encode('ascii')
+                
+        logger.info("Successfully retrieved OAuth credentials from Secrets Manager extension")
+        _CREDS_CACHE['value'] = credentials
+        _CREDS_CACHE['expires'] = time.monotonic() + CREDENTIALS_CACHE_TTL
         return credentials
         
-    except ClientError as e:
-        logger.error(f"Failed to retrieve credentials from Secrets Manager: {e}")
+    except urllib.error.URLError as e:
+        logger.error(f"Failed to retrieve credentials from Secrets Manager extension: {e}")
         raise
     except json.JSONDecodeError as e:
         logger.error(f"Invalid JSON in secret: {e}")
@@ -90,10 +216,11 @@ def mask_client_secret(client_secret: str, client_id: str) -> str:
     Returns:
         Base64 encoded masked client secret
     """
-    normalized_client_id = normalize_string(client_id)
-    combined = client_secret + normalized_client_id
-    hash_bytes = hashlib.sha256(combined.encode('utf-8')).digest()
-    return base64.b64encode(hash_bytes).decode('utf-8')
+    # Feed both parts to the OpenSSL-backed hasher instead of building a concatenated string
+    hasher = hashlib.sha256()
+    hasher.update(client_secret.encode('utf-8'))
+    hasher.update(normalize_string(client_id).encode('utf-8'))
+    return base64.b64encode(hasher.digest()).decode('ascii')
 
 def mask_password(password: str, username: str) -> str:
     """
@@ -106,13 +233,31 @@ def mask_password(password: str, username: str) -> str:
     Returns:
         Base64 encoded masked password
     """
-    normalized_username = normalize_string(username)
-    combined = password + normalized_username
-    hash_bytes = hashlib.sha256(combined.encode('utf-8')).digest()
-    return base64.b64encode(hash_bytes).decode('utf-8')
+    hasher = hashlib.sha256()
+    hasher.update(password.encode('utf-8'))
+    hasher.update(normalize_string(username).encode('utf-8'))
+    return base64.b64encode(hasher.digest()).decode('ascii')
+
+def wait_for_retry(delay: float, deadline: Optional[float]) -> bool:
+    """
+    Sleep before the next attempt unless the invocation would time out before it completes
+    
+    Args:
+        delay: Seconds to wait before retrying
+        deadline: Epoch seconds by which retries must finish, or None for no limit
+        
+    Returns:
+        True if the caller should retry, False if there is no time left for another attempt
+    """
+    if deadline is not None and time.time() + delay + MIN_ATTEMPT_TIME > deadline:
+        logger.warning(f"Not retrying: waiting {delay} seconds would exceed the invocation deadline")
+        return False
+    logger.info(f"Retrying in {delay} seconds")
+    time.sleep(delay)
+    return True
 
 def make_oauth_request(credentials: Dict[str, str], grant_type: str = "password_limited", 
-                      refresh_token: Optional[str] = None) -> Dict[str, Any]:
+                      refresh_token: Optional[str] = None, deadline: Optional[float] = None) -> Dict[str, Any]:
     """
     Make OAuth 2.1 request to iRacing API with exponential backoff
     
@@ -120,6 +265,7 @@ def make_oauth_request(credentials: Dict[str, str], grant_type: str = "password_
         credentials: OAuth credentials dictionary
         grant_type: OAuth grant type (password_limited or refresh_token)
         refresh_token: Refresh token for token renewal
+        deadline: Epoch seconds after which no further retry is started
         
     Returns:
         OAuth response dictionary
@@ -128,24 +274,15 @@ def make_oauth_request(credentials: Dict[str, str], grant_type: str = "password_
         AuthenticationError: If authentication fails
         RateLimitError: If rate limited
     """
+    # Form bodies are prebuilt at credentials load; only the refresh token needs encoding here
     if grant_type == "password_limited":
-        data = {
-            'grant_type': 'password_limited',
-            'client_id': credentials['client_id'],
-            'client_secret': mask_client_secret(credentials['client_secret'], credentials['client_id']),
-            'username': credentials['username'],
-            'password': mask_password(credentials['password'], credentials['username']),
-            'scope': 'iracing.auth'
-        }
+        data_encoded = credentials['_password_body']
+        username = credentials['username']
     elif grant_type == "refresh_token":
         if not refresh_token:
             raise ValueError("Refresh token required for refresh_token grant")
-        data = {
-            'grant_type': 'refresh_token',
-            'client_id': credentials['client_id'],
-            'client_secret': mask_client_secret(credentials['client_secret'], credentials['client_id']),
-            'refresh_token': refresh_token
-        }
+        data_encoded = credentials['_refresh_body_prefix'] + urllib.parse.quote_plus(refresh_token).encode('ascii')
+        username = 'N/A'
     else:
         raise ValueError(f"Unsupported grant type: {grant_type}")
     
@@ -155,184 +292,245 @@ def make_oauth_request(credentials: Dict[str, str], grant_type: str = "password_
     }
     
     for attempt in range(MAX_RETRIES):
+        backoff_delay = BASE_BACKOFF_DELAY * (2 ** attempt)
+        
+        # Per-attempt detail is debug-only; the guard skips building the message otherwise
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Making OAuth request to {OAUTH_TOKEN_URL} (attempt {attempt + 1}/{MAX_RETRIES}, "
+                         f"grant type: {grant_type}, client ID: {credentials['client_id']}, username: {username})")
+        
         try:
-            logger.info(f"Making OAuth request (attempt {attempt + 1}/{MAX_RETRIES})")
-            logger.info(f"Grant type: {grant_type}")
-            logger.info(f"Client ID: {data['client_id']}")
-            logger.info(f"Username: {data.get('username', 'N/A')}")
-            
-            # Encode the data for POST request
-            data_encoded = urllib.parse.urlencode(data).encode('utf-8')
-            
-            # Create request
-            req = urllib.request.Request(
-                OAUTH_TOKEN_URL,
-                data=data_encoded,
-                headers=headers
-            )
-            
-            logger.info(f"Making request to: {OAUTH_TOKEN_URL}")
-            logger.info(f"Request headers: {headers}")
+            # Pooled connection keeps the TLS session to the OAuth server alive between invocations
+            response = http_pool.request('POST', OAUTH_TOKEN_URL, body=data_encoded, headers=headers)
+        except urllib3.exceptions.HTTPError as e:
+            logger.error(f"Connection error on attempt {attempt + 1}: {e}")
+            failure = AuthenticationError(f"Request failed after {attempt + 1} attempts: {e}")
+        else:
+            # urllib3 does not raise on HTTP error statuses, so every response is dispatched here
+            status = response.status
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Response status: {status}")
             
-            try:
-                with urllib.request.urlopen(req, timeout=30) as response:
-                    logger.info(f"Response status: {response.status}")
-                    if response.status == 200:
-                        logger.info("OAuth request successful")
-                        response_data = json.loads(response.read().decode('utf-8'))
-                        return response_data
-                    elif response.status == 429:
-                        # Rate limited
-                        retry_after = int(response.headers.get('Retry-After', BASE_BACKOFF_DELAY * (2 ** attempt)))
-                        logger.warning(f"Rate limited, waiting {retry_after} seconds")
-                        if attempt < MAX_RETRIES - 1:
-                            time.sleep(retry_after)
-                            continue
-                        else:
-                            raise RateLimitError(f"Rate limited after {MAX_RETRIES} attempts")
-                    elif response.status in [401, 403]:
-                        logger.error(f"Authentication failed: {response.status}")
-                        raise AuthenticationError(f"Authentication failed: {response.status}")
-                    else:
-                        logger.error(f"OAuth request failed: {response.status}")
-                        if attempt < MAX_RETRIES - 1:
-                            backoff_delay = BASE_BACKOFF_DELAY * (2 ** attempt)
-                            logger.info(f"Retrying in {backoff_delay} seconds")
-                            time.sleep(backoff_delay)
-                            continue
-                        else:
-                            raise AuthenticationError(f"OAuth request failed after {MAX_RETRIES} attempts")
-                            
-            except urllib.error.HTTPError as e:
-                logger.error(f"HTTP Error: {e.code} - {e.reason}")
-                # Try to read error response
+            if status == 200:
                 try:
-                    error_body = e.read().decode('utf-8')
-                    logger.error(f"Error response body: {error_body}")
-                except:
-                    logger.error("Could not read error response body")
-                    
-                if e.code == 429:
-                    # Rate limited
-                    retry_after = int(e.headers.get('Retry-After', BASE_BACKOFF_DELAY * (2 ** attempt)))
-                    logger.warning(f"Rate limited, waiting {retry_after} seconds")
-                    if attempt < MAX_RETRIES - 1:
-                        time.sleep(retry_after)
-                        continue
-                    else:
-                        raise RateLimitError(f"Rate limited after {MAX_RETRIES} attempts")
-                elif e.code in [401, 403]:
-                    logger.error(f"Authentication failed: {e.code}")
-                    raise AuthenticationError(f"Authentication failed: {e.code}")
-                else:
-                    logger.error(f"OAuth request failed: {e.code}")
-                    if attempt < MAX_RETRIES - 1:
-                        backoff_delay = BASE_BACKOFF_DELAY * (2 ** attempt)
-                        logger.info(f"Retrying in {backoff_delay} seconds")
-                        time.sleep(backoff_delay)
-                        continue
-                    else:
-                        raise AuthenticationError(f"OAuth request failed after {MAX_RETRIES} attempts")
-                        
-        except urllib.error.URLError as e:
-            logger.error(f"URL error on attempt {attempt + 1}: {e}")
-            if attempt < MAX_RETRIES - 1:
-                backoff_delay = BASE_BACKOFF_DELAY * (2 ** attempt)
-                logger.info(f"Retrying in {backoff_delay} seconds")
-                time.sleep(backoff_delay)
-                continue
-            else:
-                raise AuthenticationError(f"Request failed after {MAX_RETRIES} attempts: {e}")
-        except json.JSONDecodeError as e:
-            logger.error(f"Invalid JSON response on attempt {attempt + 1}: {e}")
-            if attempt < MAX_RETRIES - 1:
-                backoff_delay = BASE_BACKOFF_DELAY * (2 ** attempt)
-                logger.info(f"Retrying in {backoff_delay} seconds")
-                time.sleep(backoff_delay)
-                continue
+                    response_data = json_loads(response.data)
+                    logger.info(f"OAuth {grant_type} request successful")
+                    return response_data
+                except json.JSONDecodeError as e:
+                    logger.error(f"Invalid JSON response on attempt {attempt + 1}: {e}")
+                    failure = AuthenticationError(f"Invalid JSON response after {attempt + 1} attempts: {e}")
             else:
-                raise AuthenticationError(f"Invalid JSON response after {MAX_RETRIES} attempts: {e}")
+                logger.error(f"Error response body: {response.data.decode('utf-8', errors='replace')}")
+                if status in (401, 403):
+                    logger.error(f"Authentication failed: {status}")
+                    # The secret may have been rotated; reload it on the next attempt
+                    _CREDS_CACHE['value'] = None
+                    raise AuthenticationError(f"Authentication failed: {status}")
+                elif status == 429:
+                    retry_after = response.headers.get('Retry-After', '')
+                    if retry_after.isdigit():
+                        backoff_delay = int(retry_after)
+                    logger.warning(f"Rate limited, waiting {backoff_delay} seconds")
+                    failure = RateLimitError(f"Rate limited after {attempt + 1} attempts")
+                else:
+                    logger.error(f"OAuth request failed: {status}")
+                    failure = AuthenticationError(f"OAuth request failed after {attempt + 1} attempts")
+        
+        # Every retryable outcome shares this single backoff site
+        if attempt < MAX_RETRIES - 1 and wait_for_retry(backoff_delay, deadline):
+            continue
+        raise failure
     
     raise AuthenticationError("Max retries exceeded")
 
-def store_tokens_in_dynamodb(username: str, oauth_response: Dict[str, Any]) -> None:
+def project_token(oauth_response: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Project the access token fields returned to callers, applying defaults once
+    
+    Args:
+        oauth_response: OAuth response or stored token data
+        
+    Returns:
+        Dict with access_token, token_type, expires_in and scope
+    """
+    return {
+        'access_token': oauth_response['access_token'],
+        'token_type': oauth_response.get('token_type', 'Bearer'),
+        'expires_in': oauth_response.get('expires_in', ACCESS_TOKEN_LIFETIME),
+        'scope': oauth_response.get('scope', 'iracing.auth')
+    }
+
+def build_token_attributes(oauth_response: Dict[str, Any], token: Dict[str, Any],
+                           expires_at: int, current_time: int) -> Dict[str, Dict[str, str]]:
+    """
+    Build the DynamoDB attribute map stored for a user's tokens
+    
+    Args:
+        oauth_response: OAuth response containing the refresh token fields
+        token: Access token fields from project_token()
+        expires_at: Epoch seconds at which the access token expires
+        current_time: Epoch seconds used to compute the refresh token TTL
+        
+    Returns:
+        Attribute values keyed by attribute name, excluding the partition key
+    """
+    attributes = {
+        'access_token': {'S': token['access_token']},
+        'token_type': {'S': token['token_type']},
+        'expires_in': {'N': str(token['expires_in'])},
+        'scope': {'S': token['scope']},
+        'ttl': {'N': str(expires_at)}
+    }
+    
+    if 'refresh_token' in oauth_response:
+        refresh_token_expires_in = oauth_response.get('refresh_token_expires_in', REFRESH_TOKEN_LIFETIME)
+        attributes['refresh_token'] = {'S': oauth_response['refresh_token']}
+        attributes['refresh_token_expires_in'] = {'N': str(refresh_token_expires_in)}
+        attributes['refresh_token_ttl'] = {'N': str(current_time + refresh_token_expires_in)}
+    
+    return attributes
+
+def store_tokens_in_dynamodb(username: str, oauth_response: Dict[str, Any],
+                             token: Dict[str, Any], expires_at: int) -> bool:
     """
     Store OAuth tokens in DynamoDB with TTL
     
+    Uses a single conditional UpdateItem so a token written by a concurrent
+    invocation is never overwritten while it is still valid.
+    
     Args:
         username: Username to use as partition key
-        oauth_response: OAuth response containing tokens
+        oauth_response: OAuth response containing the refresh token fields
+        token: Access token fields from project_token()
+        expires_at: Epoch seconds at which the access token expires
+        
+    Returns:
+        True if the tokens were stored, False if a valid token was already present
     """
     current_time = int(time.time())
-    access_token_ttl = current_time + oauth_response.get('expires_in', ACCESS_TOKEN_LIFETIME)
-    refresh_token_ttl = current_time + oauth_response.get('refresh_token_expires_in', REFRESH_TOKEN_LIFETIME)
-    
-    item = {
-        'username': {'S': username},
-        'access_token': {'S': oauth_response['access_token']},
-        'token_type': {'S': oauth_response.get('token_type', 'Bearer')},
-        'expires_in': {'N': str(oauth_response.get('expires_in', ACCESS_TOKEN_LIFETIME))},
-        'scope': {'S': oauth_response.get('scope', 'iracing.auth')},
-        'ttl': {'N': str(access_token_ttl)}
-    }
+    attributes = build_token_attributes(oauth_response, token, expires_at, current_time)
     
-    if 'refresh_token' in oauth_response:
-        item['refresh_token'] = {'S': oauth_response['refresh_token']}
-        item['refresh_token_expires_in'] = {'N': str(oauth_response.get('refresh_token_expires_in', REFRESH_TOKEN_LIFETIME))}
-        item['refresh_token_ttl'] = {'N': str(refresh_token_ttl)}
+    # Alias every attribute since names such as ttl are DynamoDB reserved words
+    update_expression = 'SET ' + ', '.join(f"#{name} = :{name}" for name in attributes)
+    attribute_names = {f"#{name}": name for name in attributes}
+    # A response without a refresh token must not leave the previous one behind
+    stale = [name for name in REFRESH_TOKEN_ATTRIBUTES if name not in attributes]
+    if stale:
+        update_expression += ' REMOVE ' + ', '.join(f"#{name}" for name in stale)
+        attribute_names.update({f"#{name}": name for name in stale})
+    attribute_values = {f":{name}": value for name, value in attributes.items()}
+    # A token inside the refresh margin may be replaced, so callers can renew it before it expires
+    attribute_values[':cutoff'] = {'N': str(current_time + TOKEN_CACHE_MARGIN)}
     
     try:
         table_name = os.environ.get('IR_AUTH_TABLE_NAME', 'ir_auth')
-        response = dynamodb.put_item(TableName=table_name, Item=item)
+        get_dynamodb_client().update_item(
+            TableName=table_name,
+            Key={'username': {'S': username}},
+            UpdateExpression=update_expression,
+            ConditionExpression='attribute_not_exists(#ttl) OR #ttl < :cutoff',
+            ExpressionAttributeNames=attribute_names,
+            ExpressionAttributeValues=attribute_values
+        )
         logger.info(f"Successfully stored tokens for user {username}")
+        return True
         
     except ClientError as e:
+        if e.response.get('Error', {}).get('Code') == 'ConditionalCheckFailedException':
+            logger.info(f"Valid token already stored for user {username}, keeping it")
+            return False
         logger.error(f"Failed to store tokens in DynamoDB: {e}")
         raise
 
-def get_existing_tokens(username: str) -> Optional[Dict[str, Any]]:
+def cache_token(token: Dict[str, Any], expires_at: int) -> None:
+    """
+    Keep the latest access token in module scope for warm invocations
+    
+    Args:
+        token: Access token fields from project_token()
+        expires_at: Epoch seconds at which the access token expires
+    """
+    global _TOKEN_CACHE
+    _TOKEN_CACHE = (token, expires_at)
+
+def get_cached_token() -> Optional[Dict[str, Any]]:
+    """
+    Return the module-scoped access token if it is not about to expire
+    
+    Returns:
+        Token data if cached and still valid, None otherwise
+    """
+    if _TOKEN_CACHE is None:
+        return None
+    token, expires_at = _TOKEN_CACHE
+    if expires_at - time.time() > TOKEN_CACHE_MARGIN:
+        return token
+    return None
+
+def parse_token_item(username: str, item: Dict[str, Any], current_time: int) -> Optional[Dict[str, Any]]:
+    """
+    Interpret a stored token item as a valid token, a refreshable token or nothing usable
+    
+    Args:
+        username: Username the item belongs to
+        item: DynamoDB item with the TOKEN_PROJECTION attributes
+        current_time: Epoch seconds to compare the TTLs against
+        
+    Returns:
+        Token data, {'refresh_token', 'expired': True} if only the refresh token is valid, None otherwise
+    """
+    # Check if access token is still valid for longer than the refresh margin
+    ttl = int(item.get('ttl', {}).get('N', '0'))
+    if ttl - TOKEN_CACHE_MARGIN > current_time:
+        logger.info(f"Found valid access token for user {username}")
+        return {
+            'access_token': item['access_token']['S'],
+            'token_type': item.get('token_type', {}).get('S', 'Bearer'),
+            'expires_in': int(item.get('expires_in', {}).get('N', '0')),
+            'scope': item.get('scope', {}).get('S', ''),
+            'refresh_token': item.get('refresh_token', {}).get('S'),
+            'refresh_token_expires_in': int(item.get('refresh_token_expires_in', {}).get('N', '0')),
+            'expires_at': ttl
+        }
+    
+    logger.info(f"Access token expired for user {username}")
+    # Check if refresh token is still valid
+    refresh_token_ttl = int(item.get('refresh_token_ttl', {}).get('N', '0'))
+    if refresh_token_ttl > current_time and 'refresh_token' in item:
+        logger.info(f"Refresh token still valid for user {username}")
+        return {
+            'refresh_token': item['refresh_token']['S'],
+            'expired': True
+        }
+    
+    logger.info(f"No valid tokens found for user {username}")
+    return None
+
+def get_existing_tokens(username: str, consistent: bool = False) -> Optional[Dict[str, Any]]:
     """
     Retrieve existing tokens from DynamoDB
     
     Args:
         username: Username to lookup
+        consistent: Use a strongly consistent read, e.g. to read back a token another invocation just stored
         
     Returns:
         Token data if found, None otherwise
     """
     try:
         table_name = os.environ.get('IR_AUTH_TABLE_NAME', 'ir_auth')
-        response = dynamodb.get_item(
+        # Fetch only the attributes read below; eventually consistent reads are fine by default
+        # because the module-level cache already tolerates slightly stale tokens
+        response = get_dynamodb_client().get_item(
             TableName=table_name,
-            Key={'username': {'S': username}}
+            Key={'username': {'S': username}},
+            ProjectionExpression=TOKEN_PROJECTION,
+            ExpressionAttributeNames=TOKEN_PROJECTION_NAMES,
+            ConsistentRead=consistent
         )
         
         if 'Item' in response:
-            item = response['Item']
-            current_time = int(time.time())
-            
-            # Check if access token is still valid
-            ttl = int(item.get('ttl', {}).get('N', '0'))
-            if ttl > current_time:
-                logger.info(f"Found valid access token for user {username}")
-                return {
-                    'access_token': item['access_token']['S'],
-                    'token_type': item.get('token_type', {}).get('S', 'Bearer'),
-                    'expires_in': int(item.get('expires_in', {}).get('N', '0')),
-                    'scope': item.get('scope', {}).get('S', ''),
-                    'refresh_token': item.get('refresh_token', {}).get('S'),
-                    'refresh_token_expires_in': int(item.get('refresh_token_expires_in', {}).get('N', '0'))
-                }
-            else:
-                logger.info(f"Access token expired for user {username}")
-                # Check if refresh token is still valid
-                refresh_token_ttl = int(item.get('refresh_token_ttl', {}).get('N', '0'))
-                if refresh_token_ttl > current_time and 'refresh_token' in item:
-                    logger.info(f"Refresh token still valid for user {username}")
-                    return {
-                        'refresh_token': item['refresh_token']['S'],
-                        'expired': True
-                    }
+            return parse_token_item(username, response['Item'], int(time.time()))
         
         logger.info(f"No valid tokens found for user {username}")
         return None
@@ -341,6 +539,126 @@ def get_existing_tokens(username: str) -> Optional[Dict[str, Any]]:
         logger.error(f"Failed to retrieve tokens from DynamoDB: {e}")
         return None
 
+def authenticate(credentials: Dict[str, str], username: str, existing_tokens: Optional[Dict[str, Any]],
+                 deadline: Optional[float] = None) -> Tuple[Dict[str, Any], str]:
+    """
+    Obtain a new access token via refresh_token grant, falling back to password_limited
+    
+    Args:
+        credentials: OAuth credentials dictionary
+        username: Username the tokens belong to
+        existing_tokens: Token data from DynamoDB, if any
+        deadline: Epoch seconds after which no further OAuth retry is started
+        
+    Returns:
+        Tuple of access token fields and the status message for the caller
+        
+    Raises:
+        AuthenticationError: If authentication fails
+        RateLimitError: If rate limited
+    """
+    oauth_response = None
+    message = 'Authentication successful'
+    
+    # Try to refresh token if available
+    if existing_tokens and existing_tokens.get('expired') and existing_tokens.get('refresh_token'):
+        try:
+            logger.info("Attempting to refresh access token")
+            oauth_response = make_oauth_request(credentials, 'refresh_token', existing_tokens['refresh_token'], deadline)
+            message = 'Authentication successful (refreshed)'
+            
+        except (AuthenticationError, RateLimitError) as e:
+            logger.warning(f"Token refresh failed, falling back to password authentication: {e}")
+    
+    if oauth_response is None:
+        # Perform new authentication using password_limited_flow
+        logger.info("Performing new OAuth 2.1 password_limited authentication")
+        oauth_response = make_oauth_request(credentials, 'password_limited', deadline=deadline)
+    
+    # Project once and reuse the same dict for storage, the cache and the response body
+    token = project_token(oauth_response)
+    expires_at = int(time.time()) + token['expires_in']
+    
+    # Store tokens in DynamoDB; if another invocation won the race, serve its token instead
+    if not store_tokens_in_dynamodb(username, oauth_response, token, expires_at):
+        # The winner's write may not have reached an eventually consistent replica yet
+        stored_tokens = get_existing_tokens(username, consistent=True)
+        if stored_tokens and not stored_tokens.get('expired'):
+            stored_token = project_token(stored_tokens)
+            cache_token(stored_token, stored_tokens['expires_at'])
+            return stored_token, 'Authentication successful (cached)'
+        logger.warning(f"Stored token for user {username} disappeared, returning the new token unsaved")
+    
+    cache_token(token, expires_at)
+    return token, message
+
+def authenticate_single_flight(credentials: Dict[str, str], username: str, existing_tokens: Optional[Dict[str, Any]],
+                               deadline: Optional[float] = None) -> Tuple[Dict[str, Any], str]:
+    """
+    Run authenticate() at most once at a time per username within this sandbox
+    
+    Concurrent callers wait for the in-flight request and reuse the token it cached.
+    
+    Args:
+        credentials: OAuth credentials dictionary
+        username: Username the tokens belong to
+        existing_tokens: Token data from DynamoDB, if any
+        deadline: Epoch seconds after which no further OAuth retry is started
+        
+    Returns:
+        Tuple of access token fields and the status message for the caller
+    """
+    with _refresh_lock:
+        inflight = _inflight.get(username)
+        if inflight is None:
+            inflight = threading.Event()
+            _inflight[username] = inflight
+            is_leader = True
+        else:
+            is_leader = False
+    
+    if not is_leader:
+        logger.info(f"Waiting for in-flight authentication for user {username}")
+        inflight.wait(timeout=INFLIGHT_WAIT_TIMEOUT)
+        cached_token = get_cached_token()
+        if cached_token:
+            return cached_token, 'Authentication successful (cached)'
+        logger.warning(f"In-flight authentication for user {username} did not produce a token")
+        return authenticate(credentials, username, existing_tokens, deadline)
+    
+    try:
+        # Another caller may have finished between our cache check and taking the lock
+        cached_token = get_cached_token()
+        if cached_token:
+            return cached_token, 'Authentication successful (cached)'
+        return authenticate(credentials, username, existing_tokens, deadline)
+    finally:
+        with _refresh_lock:
+            del _inflight[username]
+        inflight.set()
+
+def build_token_response(message: str, token: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Build the successful authentication response
+    
+    Args:
+        message: Status message for the caller
+        token: Access token fields from project_token()
+        
+    Returns:
+        HTTP response with the access token
+    """
+    return {
+        'statusCode': 200,
+        'headers': {
+            'Content-Type': 'application/json'
+        },
+        'body': json_dumps({
+            'message': message,
+            **token
+        })
+    }
+
 def lambda_handler(event, context):
     """
     Lambda handler for OAuth 2.1 authentication with iRacing API
@@ -352,6 +670,10 @@ def lambda_handler(event, context):
     Returns:
         HTTP response with authentication status
     """
+    # Scheduled refreshers invoke the function directly with a list of users
+    if 'usernames' in event:
+        return lambda_handler_batch(event, context)
+    
     try:
         logger.info("Starting OAuth 2.1 authentication process")
         
@@ -359,70 +681,30 @@ def lambda_handler(event, context):
         credentials = get_oauth_credentials()
         username = credentials['username']
         
+        # Serve the token cached by a previous warm invocation without touching DynamoDB
+        cached_token = get_cached_token()
+        if cached_token:
+            logger.info("Returning access token cached in memory")
+            return build_token_response('Authentication successful (cached)', cached_token)
+        
         # Check for existing valid tokens
         existing_tokens = get_existing_tokens(username)
         
         if existing_tokens and not existing_tokens.get('expired'):
             # Return existing valid tokens
             logger.info("Returning existing valid tokens")
-            return {
-                'statusCode': 200,
-                'headers': {
-                    'Content-Type': 'application/json'
-                },
-                'body': json.dumps({
-                    'message': 'Authentication successful (cached)',
-                    'access_token': existing_tokens['access_token'],
-                    'token_type': existing_tokens['token_type'],
-                    'expires_in': existing_tokens['expires_in'],
-                    'scope': existing_tokens['scope']
-                })
-            }
+            token = project_token(existing_tokens)
+            cache_token(token, existing_tokens['expires_at'])
+            return build_token_response('Authentication successful (cached)', token)
         
-        # Try to refresh token if available
-        if existing_tokens and existing_tokens.get('expired') and existing_tokens.get('refresh_token'):
-            try:
-                logger.info("Attempting to refresh access token")
-                oauth_response = make_oauth_request(credentials, 'refresh_token', existing_tokens['refresh_token'])
-                store_tokens_in_dynamodb(username, oauth_response)
-                
-                return {
-                    'statusCode': 200,
-                    'headers': {
-                        'Content-Type': 'application/json'
-                    },
-                    'body': json.dumps({
-                        'message': 'Authentication successful (refreshed)',
-                        'access_token': oauth_response['access_token'],
-                        'token_type': oauth_response.get('token_type', 'Bearer'),
-                        'expires_in': oauth_response.get('expires_in', ACCESS_TOKEN_LIFETIME),
-                        'scope': oauth_response.get('scope', 'iracing.auth')
-                    })
-                }
-                
-            except (AuthenticationError, RateLimitError) as e:
-                logger.warning(f"Token refresh failed, falling back to password authentication: {e}")
+        # Stop retrying early enough to store the token and respond before Lambda times out
+        deadline = None
+        if context is not None:
+            deadline = time.time() + context.get_remaining_time_in_millis() / 1000 - DEADLINE_SAFETY_MARGIN
         
-        # Perform new authentication using password_limited_flow
-        logger.info("Performing new OAuth 2.1 password_limited authentication")
-        oauth_response = make_oauth_request(credentials, 'password_limited')
-        
-        # Store tokens in DynamoDB
-        store_tokens_in_dynamodb(username, oauth_response)
-        
-        return {
-            'statusCode': 200,
-            'headers': {
-                'Content-Type': 'application/json'
-            },
-            'body': json.dumps({
-                'message': 'Authentication successful',
-                'access_token': oauth_response['access_token'],
-                'token_type': oauth_response.get('token_type', 'Bearer'),
-                'expires_in': oauth_response.get('expires_in', ACCESS_TOKEN_LIFETIME),
-                'scope': oauth_response.get('scope', 'iracing.auth')
-            })
-        }
+        # Refresh or re-authenticate, sharing the result with concurrent callers
+        token, message = authenticate_single_flight(credentials, username, existing_tokens, deadline)
+        return build_token_response(message, token)
         
     except AuthenticationError as e:
         logger.error(f"Authentication error: {e}")
@@ -431,7 +713,7 @@ def lambda_handler(event, context):
             'headers': {
                 'Content-Type': 'application/json'
             },
-            'body': json.dumps({
+            'body': json_dumps({
                 'error': 'Authentication failed',
                 'message': str(e)
             })
@@ -445,20 +727,20 @@ def lambda_handler(event, context):
                 'Content-Type': 'application/json',
                 'Retry-After': '60'
             },
-            'body': json.dumps({
+            'body': json_dumps({
                 'error': 'Rate limited',
                 'message': str(e)
             })
         }
         
-    except ClientError as e:
+    except (ClientError, urllib.error.URLError) as e:
         logger.error(f"AWS service error: {e}")
         return {
             'statusCode': 503,
             'headers': {
                 'Content-Type': 'application/json'
             },
-            'body': json.dumps({
+            'body': json_dumps({
                 'error': 'Service unavailable',
                 'message': 'AWS service temporarily unavailable'
             })
@@ -471,9 +753,240 @@ def lambda_handler(event, context):
             'headers': {
                 'Content-Type': 'application/json'
             },
-            'body': json.dumps({
+            'body': json_dumps({
+                'error': 'Internal server error',
+                'message': 'An unexpected error occurred'
+            })
+        }
+
+def batch_get_existing_tokens(usernames: List[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+    """
+    Retrieve existing tokens for many users with BatchGetItem
+    
+    Args:
+        usernames: Unique usernames to lookup
+        
+    Returns:
+        Token data (as returned by parse_token_item) keyed by username
+    """
+    table_name = os.environ.get('IR_AUTH_TABLE_NAME', 'ir_auth')
+    client = get_dynamodb_client()
+    items: Dict[str, Dict[str, Any]] = {}
+    
+    for start in range(0, len(usernames), BATCH_GET_LIMIT):
+        request_items = {
+            table_name: {
+                'Keys': [{'username': {'S': u}} for u in usernames[start:start + BATCH_GET_LIMIT]],
+                'ProjectionExpression': 'username, ' + TOKEN_PROJECTION,
+                'ExpressionAttributeNames': TOKEN_PROJECTION_NAMES
+            }
+        }
+        for attempt in range(BATCH_MAX_RETRIES):
+            response = client.batch_get_item(RequestItems=request_items)
+            for item in response.get('Responses', {}).get(table_name, []):
+                items[item['username']['S']] = item
+            request_items = response.get('UnprocessedKeys')
+            if not request_items:
+                break
+            time.sleep(BASE_BACKOFF_DELAY * (2 ** attempt) / 10)
+        else:
+            logger.warning(f"Unprocessed token keys remain after {BATCH_MAX_RETRIES} attempts; treating them as missing")
+    
+    current_time = int(time.time())
+    return {
+        u: parse_token_item(u, items[u], current_time) if u in items else None
+        for u in usernames
+    }
+
+def batch_store_tokens(items: List[Dict[str, Dict[str, str]]]) -> List[str]:
+    """
+    Store token items for many users with BatchWriteItem
+    
+    Batch puts cannot carry a condition, so each item replaces whatever is stored
+    for the user; only call this for tokens that have just been issued. Items the
+    batch write leaves unprocessed are retried and then written one at a time, since
+    a refreshed token that is not stored is lost once the old refresh token rotates.
+    
+    Args:
+        items: Full DynamoDB items including the username key
+        
+    Returns:
+        Usernames whose tokens could not be stored
+    """
+    table_name = os.environ.get('IR_AUTH_TABLE_NAME', 'ir_auth')
+    client = get_dynamodb_client()
+    leftover: List[Dict[str, Dict[str, str]]] = []
+    
+    for start in range(0, len(items), BATCH_WRITE_LIMIT):
+        request_items = {
+            table_name: [{'PutRequest': {'Item': item}} for item in items[start:start + BATCH_WRITE_LIMIT]]
+        }
+        try:
+            for attempt in range(BATCH_MAX_RETRIES):
+                response = client.batch_write_item(RequestItems=request_items)
+                request_items = response.get('UnprocessedItems')
+                if not request_items:
+                    break
+                time.sleep(BASE_BACKOFF_DELAY * (2 ** attempt) / 10)
+        except ClientError as e:
+            logger.warning(f"Batch token write failed, storing items individually: {e}")
+        if request_items:
+            leftover.extend(request['PutRequest']['Item'] for request in request_items[table_name])
+    
+    unsaved: List[str] = []
+    for item in leftover:
+        try:
+            client.put_item(TableName=table_name, Item=item)
+        except ClientError as e:
+            logger.error(f"Failed to store tokens for user {item['username']['S']}: {e}")
+            unsaved.append(item['username']['S'])
+    return unsaved
+
+def request_user_tokens(credentials: Dict[str, str], username: str, existing_tokens: Optional[Dict[str, Any]],
+                        deadline: Optional[float] = None) -> Dict[str, Any]:
+    """
+    Obtain a new OAuth response for one user of a batch refresh
+    
+    Only the user the OAuth credentials belong to can fall back to the password grant;
+    every other user needs a stored refresh token.
+    
+    Args:
+        credentials: OAuth credentials dictionary
+        username: Username the tokens belong to
+        existing_tokens: Token data from DynamoDB, if any
+        deadline: Epoch seconds after which no further OAuth retry is started
+        
+    Returns:
+        OAuth response dictionary
+        
+    Raises:
+        AuthenticationError: If authentication fails
+        RateLimitError: If rate limited
+    """
+    can_use_password = username == credentials['username']
+    
+    if existing_tokens and existing_tokens.get('refresh_token'):
+        try:
+            return make_oauth_request(credentials, 'refresh_token', existing_tokens['refresh_token'], deadline)
+        except (AuthenticationError, RateLimitError) as e:
+            if not can_use_password:
+                raise
+            logger.warning(f"Token refresh failed for user {username}, falling back to password authentication: {e}")
+    
+    if not can_use_password:
+        raise AuthenticationError(f"No valid refresh token for user {username}")
+    return make_oauth_request(credentials, 'password_limited', deadline=deadline)
+
+def lambda_handler_batch(event, context):
+    """
+    Lambda handler that refreshes tokens for many users in one invocation
+    
+    Reads all users with BatchGetItem, runs the OAuth requests for expired users
+    concurrently and writes the new tokens back with BatchWriteItem, so a scheduled
+    refresher needs a couple of DynamoDB round trips instead of two per user.
+    
+    Args:
+        event: Lambda event object with a 'usernames' list
+        context: Lambda context object
+        
+    Returns:
+        HTTP response listing valid, refreshed and failed usernames
+    """
+    try:
+        usernames = list(dict.fromkeys(event.get('usernames') or []))
+        logger.info(f"Starting batch token refresh for {len(usernames)} users")
+        
+        credentials = get_oauth_credentials()
+        existing = batch_get_existing_tokens(usernames)
+        
+        valid = [u for u in usernames if existing[u] and not existing[u].get('expired')]
+        pending = [u for u in usernames if u not in valid]
+        
+        deadline = None
+        if context is not None:
+            deadline = time.time() + context.get_remaining_time_in_millis() / 1000 - DEADLINE_SAFETY_MARGIN
+        
+        refreshed: List[str] = []
+        failed: Dict[str, str] = {}
+        items: List[Dict[str, Dict[str, str]]] = []
+        
+        if pending:
+            with ThreadPoolExecutor(max_workers=min(BATCH_MAX_WORKERS, len(pending))) as executor:
+                futures = {
+                    u: executor.submit(request_user_tokens, credentials, u, existing[u], deadline)
+                    for u in pending
+                }
+            
+            current_time = int(time.time())
+            for u, future in futures.items():
+                try:
+                    oauth_response = future.result()
+                except (AuthenticationError, RateLimitError) as e:
+                    logger.error(f"Batch refresh failed for user {u}: {e}")
+                    failed[u] = str(e)
+                    continue
+                
+                token = project_token(oauth_response)
+                expires_at = current_time + token['expires_in']
+                items.append({
+                    'username': {'S': u},
+                    **build_token_attributes(oauth_response, token, expires_at, current_time)
+                })
+                refreshed.append(u)
+                if u == credentials['username']:
+                    cache_token(token, expires_at)
+        
+        # Refreshed tokens are written before anything is reported, and a store failure
+        # only fails the affected users instead of the whole batch
+        for u in batch_store_tokens(items):
+            refreshed.remove(u)
+            failed[u] = 'Token refreshed but could not be stored'
+        logger.info(f"Batch token refresh complete: {len(valid)} valid, {len(refreshed)} refreshed, {len(failed)} failed")
+        
+        return {
+            'statusCode': 200,
+            'headers': {
+                'Content-Type': 'application/json'
+            },
+            'body': json_dumps({
+                'message': 'Batch refresh complete',
+                'valid': valid,
+                'refreshed': refreshed,
+                'failed': failed
+            })
+        }
+        
+    except (ClientError, urllib.error.URLError) as e:
+        logger.error(f"AWS service error: {e}")
+        return {
+            'statusCode': 503,
+            'headers': {
+                'Content-Type': 'application/json'
+            },
+            'body': json_dumps({
+                'error': 'Service unavailable',
+                'message': 'AWS service temporarily unavailable'
+            })
+        }
+        
+    except Exception as e:
+        logger.error(f"Unexpected error in batch refresh: {e}")
+        return {
+            'statusCode': 500,
+            'headers': {
+                'Content-Type': 'application/json'
+            },
+            'body': json_dumps({
                 'error': 'Internal server error',
                 'message': 'An unexpected error occurred'
             })
         }
 
+# Provisioned environments are initialized ahead of traffic, so pay for boto3 and the
+# credentials fetch here instead of on the first request they serve
+if os.environ.get('AWS_LAMBDA_INITIALIZATION_TYPE') == 'provisioned-concurrency':
+    try:
+        get_dynamodb_client()
+        get_oauth_credentials()
+    except Exception as e:
+        logger.warning(f"Eager initialization failed, deferring to first invocation: {str(e)}")
@@ -1,26 +1,144 @@
 import json
-import urllib.request
 import urllib.parse
-import urllib.error
+import urllib3
 import boto3
 import logging
 import os
+import random
+import threading
 import time
-from typing import Dict, Any, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Any, List, Optional, Tuple
+from botocore.config import Config
 from botocore.exceptions import ClientError
 
+try:
+    import orjson
+except ImportError:  # Not bundled by default; json_loads()/json_dumps() fall back to the stdlib
+    orjson = None
+
+def json_loads(data: bytes) -> Any:
+    """
+    Parse an iRacing or ir_auth response body
+    
+    Args:
+        data: Raw JSON bytes or string
+        
+    Returns:
+        Parsed JSON value
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def json_dumps(value: Any) -> str:
+    """
+    Serialize a response body or invoke payload; every body in this module goes through here
+    
+    Args:
+        value: Value to serialize
+        
+    Returns:
+        JSON string
+    """
+    if orjson is not None:
+        return orjson.dumps(value).decode('utf-8')
+    return json.dumps(value)
+
 # Configure structured logging
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
-# Initialize AWS clients
-dynamodb = boto3.client('dynamodb')
-lambda_client = boto3.client('lambda')
-secrets_client = boto3.client('secretsmanager')
+# Shared AWS client config; TCP keep-alive lets warm invocations reuse pooled sockets
+aws_client_config = Config(
+    tcp_keepalive=True,
+    max_pool_connections=20,
+    retries={'mode': 'standard', 'max_attempts': 3}
+)
+
+# Initialize AWS clients; DynamoDB is used on every invocation, the others only on cache misses
+dynamodb = boto3.client('dynamodb', config=aws_client_config)
+
+# Created on first use so cache-hit containers never load their service models
+lambda_client = None
+secrets_client = None
+
+# Reused across warm invocations so the iRacing API and S3 TLS sessions are not re-established each time
+http_pool = urllib3.PoolManager(
+    num_pools=2,
+    maxsize=10,
+    retries=False,
+    timeout=urllib3.Timeout(connect=5, read=30)
+)
+
+# Opens the iRacing API TLS connection in the background while DynamoDB is queried
+prewarm_executor = ThreadPoolExecutor(max_workers=1)
+
+# Configuration resolved once per container; the environment does not change between invocations
+IRACING_SECRET_NAME = os.environ.get('IRACING_SECRET_NAME', 'iracing-oauth-credentials')
+IR_AUTH_TABLE_NAME = os.environ.get('IR_AUTH_TABLE_NAME', 'ir_auth')
+IR_CUSTID_TABLE_NAME = os.environ.get('IR_CUSTID_TABLE_NAME', 'ir_custid')
+IR_RATELIMIT_TABLE_NAME = os.environ.get('IR_RATELIMIT_TABLE_NAME', 'ir_ratelimit')
+IR_AUTH_FUNCTION_ARN = os.environ.get('IR_AUTH_FUNCTION_ARN', 'ir_auth')
+IRACING_RPM_LIMIT = int(os.environ.get('IRACING_RPM_LIMIT', '100'))
 
 # Constants
 MAX_RETRIES = 3
 BASE_BACKOFF_DELAY = 1  # seconds
+MAX_BACKOFF = 8  # seconds; caps a single retry wait within the Lambda timeout
+SEARCH_LINK_TTL = 300  # seconds a cached S3 search result link is reused
+TOKEN_REFRESH_MARGIN = 60  # seconds before expiry at which ir_auth is asked to renew the token
+BACKGROUND_REFRESH_INTERVAL = 30  # seconds between background refresh requests from one container
+RATE_LIMIT_WINDOW = 60  # seconds per request budget window
+INFLIGHT_WAIT_TIMEOUT = 15  # seconds to wait on another caller's lookup of the same search term
+BATCH_GET_LIMIT = 100  # keys per BatchGetItem request
+BATCH_MAX_RETRIES = 3  # passes over unprocessed batch keys before treating them as misses
+BATCH_MAX_WORKERS = 4  # concurrent iRacing lookups in one batch invocation
+
+# Only the attributes the handler reads are fetched; ttl is a DynamoDB reserved word
+CUSTID_PROJECTION = 'cust_id, s3_link, link_ttl'
+AUTH_PROJECTION = 'access_token, #ttl'
+AUTH_PROJECTION_NAMES = {'#ttl': 'ttl'}
+
+# iRacing request templates; S3 links use signed URL authentication, so only the API call adds a bearer token
+IRACING_API_ROOT = "https://members-ng.iracing.com/"
+DRIVER_SEARCH_URL = IRACING_API_ROOT + "data/lookup/drivers?search_term={}"
+BASE_HEADERS = {
+    'User-Agent': 'iRacing-Lambda-Custid/1.0',
+    'Content-Type': 'application/json'
+}
+
+# Invariant payloads built once per container instead of on every invocation
+EMPTY_PAYLOAD = b"{}"
+JSON_HEADERS = {'Content-Type': 'application/json'}
+SEARCH_TERM_REQUIRED_BODY = json_dumps({
+    'error': 'Bad Request',
+    'message': 'Search term is required'
+})
+SERVICE_UNAVAILABLE_BODY = json_dumps({
+    'error': 'Service unavailable',
+    'message': 'AWS service temporarily unavailable'
+})
+INTERNAL_ERROR_BODY = json_dumps({
+    'error': 'Internal server error',
+    'message': 'An unexpected error occurred'
+})
+CREDENTIALS_CACHE_TTL = 600  # seconds a warm container reuses the decoded secret
+
+# Module-level credentials cache reused across warm invocations of the same sandbox
+_CREDS_CACHE: Dict[str, Any] = {'value': None, 'expires': 0.0}
+_last_background_refresh: Optional[float] = None
+_api_prewarmed = False
+
+# Batch lookups run on several threads; these keep them to one background refresh request
+# and one synchronous ir_auth invoke per rejected token
+_background_refresh_lock = threading.Lock()
+_token_lock = threading.Lock()
+_refreshed_tokens: Dict[Optional[str], str] = {}
+
+# Guards the per-search-term map of in-flight iRacing lookups and the results they produce
+_lookup_lock = threading.Lock()
+_inflight: Dict[str, Tuple[threading.Event, Dict[str, Any]]] = {}
 
 class AuthenticationError(Exception):
     """Custom exception for authentication failures"""
@@ -30,9 +148,74 @@ class APIError(Exception):
     """Custom exception for iRacing API failures"""
     pass
 
+class RateLimitError(Exception):
+    """Custom exception for an exhausted iRacing request budget"""
+    pass
+
+def get_lambda_client():
+    """
+    Return the Lambda client, creating it on first use
+    
+    Returns:
+        boto3 Lambda client
+    """
+    global lambda_client
+    if lambda_client is None:
+        lambda_client = boto3.client('lambda', config=aws_client_config)
+    return lambda_client
+
+def get_secrets_client():
+    """
+    Return the Secrets Manager client, creating it on first use
+    
+    Returns:
+        boto3 Secrets Manager client
+    """
+    global secrets_client
+    if secrets_client is None:
+        secrets_client = boto3.client('secretsmanager', config=aws_client_config)
+    return secrets_client
+
+def get_backoff_delay(attempt: int) -> float:
+    """
+    Compute a full-jitter exponential backoff delay
+    
+    Randomizing over the whole window keeps concurrent Lambdas from retrying
+    against iRacing in lockstep after a shared rate limit.
+    
+    Args:
+        attempt: Zero-based attempt number that just failed
+        
+    Returns:
+        Seconds to wait before the next attempt
+    """
+    return min(random.uniform(0, BASE_BACKOFF_DELAY * (2 ** attempt)), MAX_BACKOFF)
+
+def get_rate_limit_delay(response: urllib3.HTTPResponse, attempt: int) -> float:
+    """
+    Compute the wait after a 429, preferring the server's own hint over backoff
+    
+    Uses Retry-After (delta seconds) or x-ratelimit-reset (epoch seconds) when
+    present; HTTP-date and other forms fall back to jittered backoff.
+    
+    Args:
+        response: The 429 response from iRacing
+        attempt: Zero-based attempt number that just failed
+        
+    Returns:
+        Seconds to wait before the next attempt, capped at MAX_BACKOFF
+    """
+    retry_after = response.headers.get('Retry-After', '')
+    if retry_after.isdigit():
+        return min(float(retry_after), MAX_BACKOFF)
+    reset_at = response.headers.get('x-ratelimit-reset', '')
+    if reset_at.isdigit():
+        return min(max(float(reset_at) - time.time(), 0.0), MAX_BACKOFF)
+    return get_backoff_delay(attempt)
+
 def get_oauth_credentials() -> Dict[str, str]:
     """
-    Retrieve OAuth credentials from Secrets Manager
+    Retrieve OAuth credentials from Secrets Manager, cached for CREDENTIALS_CACHE_TTL
     
     Returns:
         Dict containing username for token lookup
@@ -40,105 +223,463 @@ def get_oauth_credentials() -> Dict[str, str]:
     Raises:
         ClientError: If secret retrieval fails
     """
+    if _CREDS_CACHE['value'] is not None and time.monotonic() < _CREDS_CACHE['expires']:
+        return _CREDS_CACHE['value']
+    
     try:
-        secret_name = os.environ.get('IRACING_SECRET_NAME', 'iracing-oauth-credentials')
-        response = secrets_client.get_secret_value(SecretId=secret_name)
-        credentials = json.loads(response['SecretString'])
+        response = get_secrets_client().get_secret_value(SecretId=IRACING_SECRET_NAME)
+        credentials = json_loads(response['SecretString'])
         
         if 'username' not in credentials:
             raise ValueError("Missing required credential: username")
                 
         logger.info("Successfully retrieved OAuth credentials from Secrets Manager")
+        _CREDS_CACHE['value'] = credentials
+        _CREDS_CACHE['expires'] = time.monotonic() + CREDENTIALS_CACHE_TTL
         return credentials
         
     except ClientError as e:
-        logger.error(f"Failed to retrieve credentials from Secrets Manager: {e}")
+        logger.error("Failed to retrieve credentials from Secrets Manager: %s", e)
         raise
     except json.JSONDecodeError as e:
-        logger.error(f"Invalid JSON in secret: {e}")
+        logger.error("Invalid JSON in secret: %s", e)
         raise
     except Exception as e:
-        logger.error(f"Unexpected error retrieving credentials: {e}")
+        logger.error("Unexpected error retrieving credentials: %s", e)
         raise
 
-def get_access_token(username: str) -> Optional[str]:
+def get_cached_username() -> Optional[str]:
+    """
+    Return the username from the credentials cache without loading the secret
+    
+    Returns:
+        Username if the cached credentials have not expired, None otherwise
+    """
+    if _CREDS_CACHE['value'] is not None and time.monotonic() < _CREDS_CACHE['expires']:
+        return _CREDS_CACHE['value']['username']
+    return None
+
+def parse_access_token(username: str, item: Optional[Dict[str, Any]]) -> Optional[str]:
+    """
+    Extract the access token from an ir_auth item if it has not expired
+    
+    Args:
+        username: Username the item belongs to
+        item: ir_auth DynamoDB item, or None if there was none
+        
+    Returns:
+        Access token if valid, None otherwise
+    """
+    if item:
+        current_time = int(time.time())
+        
+        # Check if access token is still valid
+        ttl = int(item.get('ttl', {}).get('N', '0'))
+        if ttl > current_time:
+            access_token = item['access_token']['S']
+            logger.info("Found valid access token for user %s", username)
+            if ttl - current_time < TOKEN_REFRESH_MARGIN:
+                trigger_background_refresh()
+            return access_token
+        else:
+            logger.info("Access token expired for user %s", username)
+    
+    logger.info("No valid access token found for user %s", username)
+    return None
+
+def get_access_token(username: str, consistent: bool = False) -> Optional[str]:
     """
     Retrieve valid access token from DynamoDB
     
     Args:
         username: Username to lookup tokens for
+        consistent: Use a strongly consistent read, e.g. right after ir_auth stored a new token
         
     Returns:
         Access token if valid, None otherwise
     """
     try:
-        table_name = os.environ.get('IR_AUTH_TABLE_NAME', 'ir_auth')
         response = dynamodb.get_item(
-            TableName=table_name,
-            Key={'username': {'S': username}}
+            TableName=IR_AUTH_TABLE_NAME,
+            Key={'username': {'S': username}},
+            ProjectionExpression=AUTH_PROJECTION,
+            ExpressionAttributeNames=AUTH_PROJECTION_NAMES,
+            ConsistentRead=consistent
         )
         
-        if 'Item' in response:
-            item = response['Item']
-            current_time = int(time.time())
-            
-            # Check if access token is still valid
-            ttl = int(item.get('ttl', {}).get('N', '0'))
-            if ttl > current_time:
-                access_token = item['access_token']['S']
-                logger.info(f"Found valid access token for user {username}")
-                return access_token
-            else:
-                logger.info(f"Access token expired for user {username}")
-        
-        logger.info(f"No valid access token found for user {username}")
-        return None
+        return parse_access_token(username, response.get('Item'))
         
     except ClientError as e:
-        logger.error(f"Failed to retrieve access token from DynamoDB: {e}")
+        logger.error("Failed to retrieve access token from DynamoDB: %s", e)
         return None
     except Exception as e:
-        logger.error(f"Unexpected error retrieving access token: {e}")
+        logger.error("Unexpected error retrieving access token: %s", e)
         return None
 
-def invoke_auth_lambda() -> None:
+def get_cached_custid(search_term: str) -> Optional[Dict[str, Any]]:
+    """
+    Fetch the cached customer ID item for a search term
+    
+    The cache key needs no credentials, so a hit is served before the secret
+    or the access token are touched.
+    
+    Args:
+        search_term: Driver name to look up in ir_custid
+        
+    Returns:
+        The ir_custid item, None if absent
+        
+    Raises:
+        ClientError: If DynamoDB is unavailable
+    """
+    return dynamodb.get_item(
+        TableName=IR_CUSTID_TABLE_NAME,
+        Key={'name': {'S': search_term}},
+        ProjectionExpression=CUSTID_PROJECTION
+    ).get('Item')
+
+def get_cached_items(search_term: str, username: str) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]:
+    """
+    Fetch the cached customer ID and the stored access token in one BatchGetItem
+    
+    Only used once the username is known from the credentials cache; a cold
+    container reads ir_custid alone with get_cached_custid().
+    
+    Args:
+        search_term: Driver name to look up in ir_custid
+        username: Username to look up in ir_auth
+        
+    Returns:
+        Tuple of the ir_custid item and the ir_auth item, each None if absent
+        
+    Raises:
+        ClientError: If DynamoDB is unavailable
+    """
+    custid_key = {'name': {'S': search_term}}
+    auth_key = {'username': {'S': username}}
+    
+    response = dynamodb.batch_get_item(RequestItems={
+        IR_CUSTID_TABLE_NAME: {
+            'Keys': [custid_key],
+            'ProjectionExpression': CUSTID_PROJECTION
+        },
+        IR_AUTH_TABLE_NAME: {
+            'Keys': [auth_key],
+            'ProjectionExpression': AUTH_PROJECTION,
+            'ExpressionAttributeNames': AUTH_PROJECTION_NAMES
+        }
+    })
+    responses = response.get('Responses', {})
+    custid_items = responses.get(IR_CUSTID_TABLE_NAME, [])
+    auth_items = responses.get(IR_AUTH_TABLE_NAME, [])
+    custid_item = custid_items[0] if custid_items else None
+    auth_item = auth_items[0] if auth_items else None
+    
+    # Throttled keys come back unprocessed; read those individually rather than treating them as misses
+    unprocessed = response.get('UnprocessedKeys', {})
+    if IR_CUSTID_TABLE_NAME in unprocessed:
+        custid_item = get_cached_custid(search_term)
+    if IR_AUTH_TABLE_NAME in unprocessed:
+        auth_item = dynamodb.get_item(
+            TableName=IR_AUTH_TABLE_NAME,
+            Key=auth_key,
+            ProjectionExpression=AUTH_PROJECTION,
+            ExpressionAttributeNames=AUTH_PROJECTION_NAMES
+        ).get('Item')
+    
+    return custid_item, auth_item
+
+def get_cached_custids(search_terms: List[str],
+                       username: Optional[str] = None) -> Tuple[Dict[str, Dict[str, Any]], Optional[Dict[str, Any]]]:
+    """
+    Fetch the cached customer ID items for many search terms with BatchGetItem
+    
+    Args:
+        search_terms: Unique driver names to look up in ir_custid
+        username: Username to also look up in ir_auth, if already known from the credentials cache
+        
+    Returns:
+        Tuple of the ir_custid items keyed by search term, leaving absent terms out,
+        and the ir_auth item, None if absent or not requested
+        
+    Raises:
+        ClientError: If DynamoDB is unavailable
+    """
+    custid_items: Dict[str, Dict[str, Any]] = {}
+    auth_item = None
+    
+    for start in range(0, len(search_terms), BATCH_GET_LIMIT):
+        request_items = {
+            IR_CUSTID_TABLE_NAME: {
+                'Keys': [{'name': {'S': term}} for term in search_terms[start:start + BATCH_GET_LIMIT]],
+                'ProjectionExpression': '#name, ' + CUSTID_PROJECTION,
+                'ExpressionAttributeNames': {'#name': 'name'}
+            }
+        }
+        # The ir_auth key rides along with the first request only; the limit is per table
+        if username and start == 0:
+            request_items[IR_AUTH_TABLE_NAME] = {
+                'Keys': [{'username': {'S': username}}],
+                'ProjectionExpression': AUTH_PROJECTION,
+                'ExpressionAttributeNames': AUTH_PROJECTION_NAMES
+            }
+        for attempt in range(BATCH_MAX_RETRIES):
+            response = dynamodb.batch_get_item(RequestItems=request_items)
+            responses = response.get('Responses', {})
+            for item in responses.get(IR_CUSTID_TABLE_NAME, []):
+                custid_items[item['name']['S']] = item
+            for item in responses.get(IR_AUTH_TABLE_NAME, []):
+                auth_item = item
+            
+            request_items = response.get('UnprocessedKeys')
+            if not request_items:
+                break
+            time.sleep(BASE_BACKOFF_DELAY * (2 ** attempt) / 10)
+        else:
+            logger.warning("Unprocessed cache keys remain after maximum retries; treating them as misses")
+    
+    return custid_items, auth_item
+
+def trigger_background_refresh() -> None:
+    """
+    Ask ir_auth to renew a token that is about to expire without waiting for it
+    
+    The current token stays in use for this request; at most one asynchronous
+    invoke is sent per BACKGROUND_REFRESH_INTERVAL from this container.
+    """
+    global _last_background_refresh
+    now = time.monotonic()
+    with _background_refresh_lock:
+        if _last_background_refresh is not None and now - _last_background_refresh < BACKGROUND_REFRESH_INTERVAL:
+            return
+        _last_background_refresh = now
+    
+    try:
+        get_lambda_client().invoke(
+            FunctionName=IR_AUTH_FUNCTION_ARN,
+            InvocationType='Event',
+            Payload=EMPTY_PAYLOAD
+        )
+        logger.info("Triggered background token refresh")
+        
+    except ClientError as e:
+        logger.warning("Failed to trigger background token refresh: %s", e)
+        # Don't raise - the synchronous path still refreshes once the token expires
+
+def invoke_auth_lambda() -> Optional[str]:
     """
     Invoke ir_auth Lambda function to refresh authentication
     
+    Returns:
+        Access token from the ir_auth response, None if the response did not include one
+        
     Raises:
         AuthenticationError: If authentication fails
     """
     try:
         logger.info("Invoking ir_auth Lambda for token refresh")
-        response = lambda_client.invoke(
-            FunctionName=os.environ.get('IR_AUTH_FUNCTION_ARN', 'ir_auth'),
+        response = get_lambda_client().invoke(
+            FunctionName=IR_AUTH_FUNCTION_ARN,
             InvocationType='RequestResponse',
-            Payload=json.dumps({})
+            Payload=EMPTY_PAYLOAD
         )
         
         if response['StatusCode'] != 200:
             raise AuthenticationError(f"ir_auth Lambda returned status {response['StatusCode']}")
             
-        payload = json.loads(response['Payload'].read())
+        payload = json_loads(response['Payload'].read())
         if payload.get('statusCode') != 200:
             raise AuthenticationError(f"ir_auth Lambda failed: {payload.get('body', 'Unknown error')}")
             
         logger.info("Successfully invoked ir_auth Lambda")
         
+        # ir_auth returns the token it just issued or cached, so there is no need to read it back
+        body = payload.get('body')
+        return json_loads(body).get('access_token') if body else None
+        
     except ClientError as e:
-        logger.error(f"Failed to invoke ir_auth Lambda: {e}")
+        logger.error("Failed to invoke ir_auth Lambda: %s", e)
         raise AuthenticationError(f"Failed to invoke authentication: {e}")
     except Exception as e:
-        logger.error(f"Unexpected error invoking ir_auth Lambda: {e}")
+        logger.error("Unexpected error invoking ir_auth Lambda: %s", e)
         raise AuthenticationError(f"Authentication invocation failed: {e}")
 
-def search_driver_with_auth(search_term: str, access_token: str) -> Dict[str, Any]:
+def refresh_access_token(username: str, stale_token: Optional[str]) -> str:
+    """
+    Obtain a new access token from ir_auth, sharing the refresh between threads
+    
+    Args:
+        username: Username the access token belongs to
+        stale_token: Access token iRacing rejected, or None if there was no valid token
+        
+    Returns:
+        Fresh access token
+        
+    Raises:
+        AuthenticationError: If no token can be obtained after authentication
+    """
+    with _token_lock:
+        # Another thread already replaced this token while we were waiting
+        if stale_token in _refreshed_tokens:
+            return _refreshed_tokens[stale_token]
+        
+        # Fall back to reading the stored token only if ir_auth did not return one
+        access_token = invoke_auth_lambda() or get_access_token(username, consistent=True)
+        
+        if not access_token:
+            raise AuthenticationError("Failed to obtain access token after authentication")
+        
+        _refreshed_tokens.clear()
+        _refreshed_tokens[stale_token] = access_token
+        return access_token
+
+def acquire_rate_limit_slot() -> bool:
+    """
+    Reserve one iRacing API request in the fleet-wide per-minute budget
+    
+    Every container counts against one ir_ratelimit item per window, so concurrent
+    Lambdas together stay under IRACING_RPM_LIMIT. A single conditional UpdateItem
+    creates or increments the window's counter, and expired windows are left to
+    the table's TTL. DynamoDB errors fail open rather than blocking lookups.
+    
+    Returns:
+        True if the request may proceed, False if this window's budget is spent
+    """
+    window_start = int(time.time()) // RATE_LIMIT_WINDOW * RATE_LIMIT_WINDOW
+    
+    try:
+        dynamodb.update_item(
+            TableName=IR_RATELIMIT_TABLE_NAME,
+            Key={'window_start': {'N': str(window_start)}},
+            UpdateExpression='ADD request_count :one SET #ttl = if_not_exists(#ttl, :expires)',
+            ConditionExpression='attribute_not_exists(request_count) OR request_count < :limit',
+            ExpressionAttributeNames={'#ttl': 'ttl'},
+            ExpressionAttributeValues={
+                ':one': {'N': '1'},
+                ':limit': {'N': str(IRACING_RPM_LIMIT)},
+                # Outlive the window by a full window so clock skew between containers cannot reset a live counter
+                ':expires': {'N': str(window_start + 2 * RATE_LIMIT_WINDOW)}
+            }
+        )
+        return True
+        
+    except ClientError as e:
+        if e.response.get('Error', {}).get('Code') == 'ConditionalCheckFailedException':
+            logger.warning("iRacing request budget of %s per minute exhausted", IRACING_RPM_LIMIT)
+            return False
+        logger.warning("Rate limiter unavailable, allowing request: %s", e)
+        return True
+
+def request_with_retries(url: str, headers: Dict[str, str], description: str,
+                         max_attempts: int = MAX_RETRIES, acquire: Optional[Callable[[], bool]] = None) -> Any:
+    """
+    GET a JSON document from iRacing with jittered exponential backoff
+    
+    Args:
+        url: URL to request
+        headers: Request headers
+        description: Name of the request used in log and error messages
+        max_attempts: Number of attempts before giving up
+        acquire: Called before every attempt, retries included, to reserve a slot in the
+            request budget; the request is abandoned once it returns False
+        
+    Returns:
+        Parsed JSON response
+        
+    Raises:
+        APIError: If the request keeps failing after max_attempts attempts
+        AuthenticationError: If the request is rejected with 401
+        RateLimitError: If acquire refuses an attempt
+    """
+    for attempt in range(max_attempts):
+        if acquire is not None and not acquire():
+            raise RateLimitError("iRacing request budget exhausted, try again shortly")
+        
+        try:
+            # urllib3 does not raise on HTTP error statuses, so every response is dispatched here
+            response = http_pool.request('GET', url, headers=headers)
+        except urllib3.exceptions.HTTPError as e:
+            logger.error("Connection error on attempt %s: %s", attempt + 1, e)
+            failure = APIError(f"{description} failed after {attempt + 1} attempts: {e}")
+            backoff_delay = get_backoff_delay(attempt)
+        else:
+            if response.status == 200:
+                try:
+                    return json_loads(response.data)
+                except json.JSONDecodeError as e:
+                    logger.error("Invalid JSON response on attempt %s: %s", attempt + 1, e)
+                    failure = APIError(f"Invalid JSON response after {attempt + 1} attempts: {e}")
+                    backoff_delay = get_backoff_delay(attempt)
+            elif response.status == 401:
+                logger.error("Authentication failed on %s - token may be expired", description.lower())
+                raise AuthenticationError("Access token expired or invalid")
+            elif response.status == 429:
+                logger.warning("Rate limited by iRacing API")
+                failure = APIError("Rate limited after maximum retries")
+                backoff_delay = get_rate_limit_delay(response, attempt)
+            else:
+                logger.error("%s failed: %s", description, response.status)
+                failure = APIError(f"{description} failed: {response.status}")
+                backoff_delay = get_backoff_delay(attempt)
+        
+        # Every retryable outcome shares this single backoff site
+        if attempt < max_attempts - 1:
+            logger.info("Retrying in %.2f seconds", backoff_delay)
+            time.sleep(backoff_delay)
+            continue
+        raise failure
+    
+    raise APIError("Max retries exceeded")
+
+def get_cached_search_link(item: Optional[Dict[str, Any]]) -> Optional[str]:
+    """
+    Extract a still-valid S3 search result link from an ir_custid item
+    
+    Args:
+        item: ir_custid DynamoDB item for the search term, or None
+        
+    Returns:
+        Signed S3 link if cached and within SEARCH_LINK_TTL, None otherwise
+    """
+    if item and 's3_link' in item and int(item.get('link_ttl', {}).get('N', '0')) > int(time.time()):
+        return item['s3_link']['S']
+    return None
+
+def cache_search_link(search_term: str, link: str) -> None:
+    """
+    Cache the S3 search result link for a search term
+    
+    Only the link attributes are set, so a customer ID cached under the same
+    name is left untouched.
+    
+    Args:
+        search_term: Driver name that was searched for
+        link: Signed S3 link returned by the lookup request
+    """
+    try:
+        dynamodb.update_item(
+            TableName=IR_CUSTID_TABLE_NAME,
+            Key={'name': {'S': search_term}},
+            UpdateExpression='SET s3_link = :link, link_ttl = :link_ttl',
+            ExpressionAttributeValues={
+                ':link': {'S': link},
+                ':link_ttl': {'N': str(int(time.time()) + SEARCH_LINK_TTL)}
+            }
+        )
+        
+    except ClientError as e:
+        logger.error("Failed to cache search link: %s", e)
+        # Don't raise - caching failure shouldn't break the main flow
+
+def search_driver_with_auth(search_term: str, access_token: str,
+                            cached_link: Optional[str] = None) -> Dict[str, Any]:
     """
     Search for driver using Bearer token authentication
     
     Args:
         search_term: Driver name to search for
         access_token: OAuth access token
+        cached_link: S3 search result link from a recent lookup of the same term, if any
         
     Returns:
         Driver information dictionary
@@ -146,192 +687,302 @@ def search_driver_with_auth(search_term: str, access_token: str) -> Dict[str, An
     Raises:
         APIError: If API request fails
         AuthenticationError: If authentication fails
+        RateLimitError: If the iRacing request budget is exhausted
     """
-    headers = {
-        'Authorization': f'Bearer {access_token}',
-        'User-Agent': 'iRacing-Lambda-Custid/1.0',
-        'Content-Type': 'application/json'
-    }
+    headers = {'Authorization': 'Bearer ' + access_token, **BASE_HEADERS}
     
-    for attempt in range(MAX_RETRIES):
+    logger.info("Searching for driver '%s'", search_term)
+    
+    drivers_data = None
+    if cached_link:
+        # A recent lookup's signed link skips the API hop; one attempt, since it may have expired
         try:
-            logger.info(f"Searching for driver '{search_term}' (attempt {attempt + 1}/{MAX_RETRIES})")
-            
-            # First request to get the search link
-            search_url = f"https://members-ng.iracing.com/data/lookup/drivers?search_term={urllib.parse.quote(search_term)}"
-            req = urllib.request.Request(search_url, headers=headers)
-            
-            try:
-                with urllib.request.urlopen(req, timeout=30) as response:
-                    if response.status == 401:
-                        logger.error("Authentication failed - token may be expired")
-                        raise AuthenticationError("Access token expired or invalid")
-                    elif response.status == 429:
-                        logger.warning("Rate limited by iRacing API")
-                        if attempt < MAX_RETRIES - 1:
-                            backoff_delay = BASE_BACKOFF_DELAY * (2 ** attempt)
-                            logger.info(f"Retrying in {backoff_delay} seconds")
-                            time.sleep(backoff_delay)
-                            continue
-                        else:
-                            raise APIError("Rate limited after maximum retries")
-                    elif response.status != 200:
-                        logger.error(f"Search request failed: {response.status}")
-                        if attempt < MAX_RETRIES - 1:
-                            backoff_delay = BASE_BACKOFF_DELAY * (2 ** attempt)
-                            logger.info(f"Retrying in {backoff_delay} seconds")
-                            time.sleep(backoff_delay)
-                            continue
-                        else:
-                            raise APIError(f"Search request failed: {response.status}")
-                    
-                    search_data = json.loads(response.read().decode('utf-8'))
-                    
-            except urllib.error.HTTPError as e:
-                if e.code == 401:
-                    logger.error("Authentication failed - token may be expired")
-                    raise AuthenticationError("Access token expired or invalid")
-                elif e.code == 429:
-                    logger.warning("Rate limited by iRacing API")
-                    if attempt < MAX_RETRIES - 1:
-                        backoff_delay = BASE_BACKOFF_DELAY * (2 ** attempt)
-                        logger.info(f"Retrying in {backoff_delay} seconds")
-                        time.sleep(backoff_delay)
-                        continue
-                    else:
-                        raise APIError("Rate limited after maximum retries")
-                else:
-                    logger.error(f"Search request failed: {e.code}")
-                    if attempt < MAX_RETRIES - 1:
-                        backoff_delay = BASE_BACKOFF_DELAY * (2 ** attempt)
-                        logger.info(f"Retrying in {backoff_delay} seconds")
-                        time.sleep(backoff_delay)
-                        continue
-                    else:
-                        raise APIError(f"Search request failed: {e.code}")
-            
-            if 'link' not in search_data:
-                logger.error("No link found in search response")
-                raise APIError("Invalid search response format")
-            
-            # Second request to get the actual driver data
-            driver_url = search_data['link']
-            # S3 URLs don't need Authorization header - they use signed URL authentication
-            s3_headers = {
-                'User-Agent': 'iRacing-Lambda-Custid/1.0',
-                'Content-Type': 'application/json'
-            }
-            driver_req = urllib.request.Request(driver_url, headers=s3_headers)
-            
-            try:
-                with urllib.request.urlopen(driver_req, timeout=30) as response:
-                    if response.status == 401:
-                        logger.error("Authentication failed on driver data request")
-                        raise AuthenticationError("Access token expired or invalid")
-                    elif response.status != 200:
-                        logger.error(f"Driver data request failed: {response.status}")
-                        if attempt < MAX_RETRIES - 1:
-                            backoff_delay = BASE_BACKOFF_DELAY * (2 ** attempt)
-                            logger.info(f"Retrying in {backoff_delay} seconds")
-                            time.sleep(backoff_delay)
-                            continue
-                        else:
-                            raise APIError(f"Driver data request failed: {response.status}")
-                    
-                    drivers_data = json.loads(response.read().decode('utf-8'))
-                    
-            except urllib.error.HTTPError as e:
-                if e.code == 401:
-                    logger.error("Authentication failed on driver data request")
-                    raise AuthenticationError("Access token expired or invalid")
-                else:
-                    logger.error(f"Driver data request failed: {e.code}")
-                    if attempt < MAX_RETRIES - 1:
-                        backoff_delay = BASE_BACKOFF_DELAY * (2 ** attempt)
-                        logger.info(f"Retrying in {backoff_delay} seconds")
-                        time.sleep(backoff_delay)
-                        continue
-                    else:
-                        raise APIError(f"Driver data request failed: {e.code}")
-            
-            if not drivers_data:
-                logger.info(f"No drivers found for search term: {search_term}")
+            drivers_data = request_with_retries(cached_link, BASE_HEADERS, "Cached driver data request", max_attempts=1)
+        except APIError as e:
+            logger.info("Cached search link unusable, repeating lookup: %s", e)
+    
+    if drivers_data is None:
+        # First request to get the search link. Only the members API is rate limited, so every
+        # attempt of this request takes a budget slot and the S3 hops below take none
+        search_url = DRIVER_SEARCH_URL.format(urllib.parse.quote(search_term))
+        search_data = request_with_retries(search_url, headers, "Search request", acquire=acquire_rate_limit_slot)
+        
+        if 'link' not in search_data:
+            logger.error("No link found in search response")
+            raise APIError("Invalid search response format")
+        
+        cache_search_link(search_term, search_data['link'])
+        
+        # Second request to get the actual driver data
+        drivers_data = request_with_retries(search_data['link'], BASE_HEADERS, "Driver data request")
+    
+    if not drivers_data:
+        logger.info("No drivers found for search term: %s", search_term)
+        return {
+            'custid': '0',
+            'name': f'Not found: {search_term}',
+            'origin': 'iRacing'
+        }
+    
+    # Handle multiple results - look for exact match first
+    if len(drivers_data) > 1:
+        for driver in drivers_data:
+            if driver.get('display_name') == search_term:
+                logger.info("Found exact match for '%s': %s", search_term, driver['cust_id'])
+                # Cache the result
+                cache_driver_result(driver['display_name'], driver['cust_id'])
                 return {
-                    'custid': 0,
-                    'name': f'Not found: {search_term}',
+                    'custid': str(driver['cust_id']),
+                    'name': str(driver['display_name']),
                     'origin': 'iRacing'
                 }
-            
-            # Handle multiple results - look for exact match first
-            if len(drivers_data) > 1:
-                for driver in drivers_data:
-                    if driver.get('display_name') == search_term:
-                        logger.info(f"Found exact match for '{search_term}': {driver['cust_id']}")
-                        # Cache the result
-                        cache_driver_result(driver['display_name'], driver['cust_id'])
-                        return {
-                            'custid': str(driver['cust_id']),
-                            'name': str(driver['display_name']),
-                            'origin': 'iRacing'
-                        }
-            
-            # Use first result if no exact match
-            driver = drivers_data[0]
-            logger.info(f"Found driver for '{search_term}': {driver['display_name']} ({driver['cust_id']})")
-            
-            # Cache the result
-            cache_driver_result(driver['display_name'], driver['cust_id'])
-            
-            return {
-                'custid': str(driver['cust_id']),
-                'name': str(driver['display_name']),
-                'origin': 'iRacing'
-            }
-            
-        except urllib.error.URLError as e:
-            logger.error(f"URL error on attempt {attempt + 1}: {e}")
-            if attempt < MAX_RETRIES - 1:
-                backoff_delay = BASE_BACKOFF_DELAY * (2 ** attempt)
-                logger.info(f"Retrying in {backoff_delay} seconds")
-                time.sleep(backoff_delay)
-                continue
-            else:
-                raise APIError(f"Request failed after {MAX_RETRIES} attempts: {e}")
-        except json.JSONDecodeError as e:
-            logger.error(f"Invalid JSON response on attempt {attempt + 1}: {e}")
-            if attempt < MAX_RETRIES - 1:
-                backoff_delay = BASE_BACKOFF_DELAY * (2 ** attempt)
-                logger.info(f"Retrying in {backoff_delay} seconds")
-                time.sleep(backoff_delay)
-                continue
-            else:
-                raise APIError(f"Invalid JSON response after {MAX_RETRIES} attempts: {e}")
     
-    raise APIError("Max retries exceeded")
+    # Use first result if no exact match
+    driver = drivers_data[0]
+    logger.info("Found driver for '%s': %s (%s)", search_term, driver['display_name'], driver['cust_id'])
+    
+    # Cache the result
+    cache_driver_result(driver['display_name'], driver['cust_id'])
+    
+    return {
+        'custid': str(driver['cust_id']),
+        'name': str(driver['display_name']),
+        'origin': 'iRacing'
+    }
 
 def cache_driver_result(name: str, cust_id: int) -> None:
     """
     Cache driver lookup result in DynamoDB
     
+    Uses a conditional UpdateItem so an unchanged mapping costs no write and
+    any cached search link on the same item is preserved.
+    
     Args:
         name: Driver display name
         cust_id: Driver customer ID
     """
     try:
-        table_name = os.environ.get('IR_CUSTID_TABLE_NAME', 'ir_custid')
-        response = dynamodb.put_item(
-            TableName=table_name,
-            Item={
-                'name': {'S': str(name)},
-                'cust_id': {'N': str(cust_id)}
-            }
+        dynamodb.update_item(
+            TableName=IR_CUSTID_TABLE_NAME,
+            Key={'name': {'S': str(name)}},
+            UpdateExpression='SET cust_id = :c',
+            ConditionExpression='attribute_not_exists(cust_id) OR cust_id <> :c',
+            ExpressionAttributeValues={':c': {'N': str(cust_id)}}
         )
-        logger.info(f"Cached driver result: {name} -> {cust_id}")
+        logger.info("Cached driver result: %s -> %s", name, cust_id)
         
     except ClientError as e:
-        logger.error(f"Failed to cache driver result: {e}")
+        if e.response.get('Error', {}).get('Code') == 'ConditionalCheckFailedException':
+            logger.info("Driver result already cached: %s -> %s", name, cust_id)
+            return
+        logger.error("Failed to cache driver result: %s", e)
         # Don't raise - caching failure shouldn't break the main flow
 
+def prewarm_api_connection() -> None:
+    """
+    Open the pooled TLS connection to the iRacing API ahead of a lookup
+    
+    Runs on prewarm_executor so DNS, TCP and TLS setup overlap the rest of the
+    miss path. Only submitted after a cache miss, so containers serving cached
+    names never send it.
+    """
+    try:
+        http_pool.request('HEAD', IRACING_API_ROOT, redirect=False,
+                          timeout=urllib3.Timeout(connect=2, read=2))
+    except urllib3.exceptions.HTTPError as e:
+        logger.info("iRacing API connection prewarm failed: %s", e)
+
+def try_cache_hit(search_term: str, custid_item: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """
+    Build the response for a cached customer ID
+    
+    Args:
+        search_term: Driver name that was searched for
+        custid_item: ir_custid DynamoDB item for the search term, or None
+        
+    Returns:
+        HTTP response if the item holds a customer ID, None otherwise
+    """
+    # Items holding only a cached search link are not customer ID hits
+    if not custid_item or 'cust_id' not in custid_item:
+        return None
+    
+    logger.info("Found cached result for '%s'", search_term)
+    return {
+        'statusCode': 200,
+        'headers': JSON_HEADERS,
+        'body': json_dumps({
+            'custid': custid_item['cust_id']['N'],
+            'name': search_term,
+            'origin': 'DynamoDB'
+        })
+    }
+
+def lookup_uncached_driver(search_term: str, username: str, custid_item: Optional[Dict[str, Any]],
+                           access_token: Optional[str]) -> Dict[str, Any]:
+    """
+    Resolve a driver that is not cached, obtaining an access token as needed
+    
+    Args:
+        search_term: Driver name to search for
+        username: Username the access token belongs to
+        custid_item: ir_custid DynamoDB item for the search term, or None
+        access_token: Stored access token from get_access_token(), or None
+        
+    Returns:
+        Driver information dictionary
+        
+    Raises:
+        APIError: If API request fails
+        AuthenticationError: If authentication fails
+        RateLimitError: If the iRacing request budget is exhausted
+    """
+    logger.info("No cached result found for '%s', querying iRacing API", search_term)
+    
+    # Lookups starting after another thread's refresh skip the token that was already replaced
+    access_token = _refreshed_tokens.get(access_token, access_token)
+    
+    if not access_token:
+        logger.info("No valid access token found, invoking ir_auth Lambda")
+        access_token = refresh_access_token(username, None)
+    
+    # Search for driver using Bearer token
+    try:
+        return search_driver_with_auth(search_term, access_token, get_cached_search_link(custid_item))
+    except AuthenticationError:
+        logger.info("Authentication failed, retrying with fresh token")
+        # Token might have expired, try refreshing
+        access_token = refresh_access_token(username, access_token)
+        return search_driver_with_auth(search_term, access_token)
+
+def lookup_driver_single_flight(search_term: str, username: str, custid_item: Optional[Dict[str, Any]],
+                                access_token: Optional[str]) -> Dict[str, Any]:
+    """
+    Run lookup_uncached_driver() at most once at a time per search term within this sandbox
+    
+    Concurrent callers wait for the in-flight lookup and reuse its result.
+    
+    Args:
+        search_term: Driver name to search for
+        username: Username the access token belongs to
+        custid_item: ir_custid DynamoDB item for the search term, or None
+        access_token: Stored access token from get_access_token(), or None
+        
+    Returns:
+        Driver information dictionary
+    """
+    with _lookup_lock:
+        inflight = _inflight.get(search_term)
+        if inflight is None:
+            inflight = (threading.Event(), {})
+            _inflight[search_term] = inflight
+            is_leader = True
+        else:
+            is_leader = False
+    
+    done, outcome = inflight
+    if not is_leader:
+        logger.info("Waiting for in-flight lookup of '%s'", search_term)
+        done.wait(timeout=INFLIGHT_WAIT_TIMEOUT)
+        if 'result' in outcome:
+            return outcome['result']
+        logger.warning("In-flight lookup of '%s' did not produce a result", search_term)
+        return lookup_uncached_driver(search_term, username, custid_item, access_token)
+    
+    try:
+        outcome['result'] = lookup_uncached_driver(search_term, username, custid_item, access_token)
+        return outcome['result']
+    finally:
+        with _lookup_lock:
+            del _inflight[search_term]
+        done.set()
+
+def lambda_handler_batch(event, context):
+    """
+    Lambda handler that resolves customer IDs for many drivers in one invocation
+    
+    Used by ir_drivers so that all of its cache misses cost a single Lambda invoke.
+    Cached IDs are read with BatchGetItem, and the remaining drivers are searched
+    concurrently through the same single-flight path as single lookups.
+    
+    Args:
+        event: Lambda event object with a 'names' list
+        context: Lambda context object
+        
+    Returns:
+        HTTP response mapping each resolved name to its customer ID as a string,
+        '0' for drivers that were not found; names that failed are left out so
+        the caller can retry them individually
+    """
+    global _api_prewarmed
+    try:
+        names = list(dict.fromkeys(name for name in event.get('names') or [] if name))
+        logger.info("Starting batch customer ID lookup for %s drivers", len(names))
+        
+        # A warm credentials cache names the ir_auth key, so the stored token rides along with the cache read
+        cached_username = get_cached_username()
+        custid_items, auth_item = get_cached_custids(names, cached_username)
+        
+        custids: Dict[str, str] = {}
+        misses: List[str] = []
+        for name in names:
+            item = custid_items.get(name)
+            # Items holding only a cached search link are not customer ID hits
+            if item and 'cust_id' in item:
+                custids[name] = item['cust_id']['N']
+            else:
+                misses.append(name)
+        
+        if misses:
+            if not _api_prewarmed:
+                _api_prewarmed = True
+                prewarm_executor.submit(prewarm_api_connection)
+            
+            # Otherwise credentials and the stored token are only loaded once a lookup has to go to iRacing
+            if cached_username:
+                username = cached_username
+                access_token = parse_access_token(username, auth_item)
+            else:
+                username = get_oauth_credentials()['username']
+                access_token = get_access_token(username)
+            
+            with ThreadPoolExecutor(max_workers=min(BATCH_MAX_WORKERS, len(misses))) as executor:
+                futures = {
+                    name: executor.submit(lookup_driver_single_flight, name, username, custid_items.get(name), access_token)
+                    for name in misses
+                }
+            
+            for name, future in futures.items():
+                try:
+                    custids[name] = future.result()['custid']
+                except (APIError, AuthenticationError, RateLimitError) as e:
+                    logger.error("Batch lookup failed for '%s': %s", name, e)
+        
+        logger.info("Batch lookup complete: %s cached, %s searched, %s failed",
+                    len(names) - len(misses), len(misses), len(names) - len(custids))
+        
+        return {
+            'statusCode': 200,
+            'headers': JSON_HEADERS,
+            'body': json_dumps(custids)
+        }
+        
+    except ClientError as e:
+        logger.error("AWS service error: %s", e)
+        return {
+            'statusCode': 503,
+            'headers': JSON_HEADERS,
+            'body': SERVICE_UNAVAILABLE_BODY
+        }
+        
+    except Exception as e:
+        logger.error("Unexpected error: %s", e)
+        return {
+            'statusCode': 500,
+            'headers': JSON_HEADERS,
+            'body': INTERNAL_ERROR_BODY
+        }
+
 def lambda_handler(event, context):
     """
     Lambda handler for customer ID lookup with OAuth Bearer token authentication
@@ -343,6 +994,15 @@ def lambda_handler(event, context):
     Returns:
         HTTP response with customer ID information
     """
+    global _api_prewarmed
+    
+    # Tokens replaced during an earlier invocation may have expired since
+    _refreshed_tokens.clear()
+    
+    # ir_drivers invokes this function directly with a list of names
+    if 'names' in event:
+        return lambda_handler_batch(event, context)
+    
     try:
         logger.info("Starting customer ID lookup process")
         
@@ -352,111 +1012,98 @@ def lambda_handler(event, context):
             logger.error("No search term provided")
             return {
                 'statusCode': 400,
-                'headers': {'Content-Type': 'application/json'},
-                'body': json.dumps({
-                    'error': 'Bad Request',
-                    'message': 'Search term is required'
-                })
+                'headers': JSON_HEADERS,
+                'body': SEARCH_TERM_REQUIRED_BODY
             }
         
-        logger.info(f"Searching for driver: {search_term}")
+        logger.info("Searching for driver: %s", search_term)
         
-        # Check cache first
-        custid_table_name = os.environ.get('IR_CUSTID_TABLE_NAME', 'ir_custid')
-        response = dynamodb.get_item(
-            TableName=custid_table_name,
-            Key={'name': {'S': search_term}}
-        )
+        # Check cache first. The cache key needs no credentials, and a warm credentials
+        # cache names the ir_auth key so the stored token is read in the same request
+        cached_username = get_cached_username()
+        if cached_username:
+            custid_item, auth_item = get_cached_items(search_term, cached_username)
+        else:
+            custid_item, auth_item = get_cached_custid(search_term), None
         
-        if 'Item' in response:
-            logger.info(f"Found cached result for '{search_term}'")
-            custid = {
-                'custid': response['Item']['cust_id']['N'],
-                'name': search_term,
-                'origin': 'DynamoDB'
-            }
+        # Fast path: a cache hit returns without touching any of the lookup machinery
+        response = try_cache_hit(search_term, custid_item)
+        if response:
+            return response
+        
+        # The first miss in a container has no pooled API connection yet
+        if not _api_prewarmed:
+            _api_prewarmed = True
+            prewarm_executor.submit(prewarm_api_connection)
+        
+        if cached_username:
+            username = cached_username
+            access_token = parse_access_token(username, auth_item)
         else:
-            logger.info(f"No cached result found for '{search_term}', querying iRacing API")
-            
-            # Get OAuth credentials to determine username
-            credentials = get_oauth_credentials()
-            username = credentials['username']
-            
-            # Get access token
+            # Get OAuth credentials to determine username (cached across warm invocations)
+            username = get_oauth_credentials()['username']
             access_token = get_access_token(username)
-            
-            if not access_token:
-                logger.info("No valid access token found, invoking ir_auth Lambda")
-                invoke_auth_lambda()
-                # Retry getting access token after authentication
-                access_token = get_access_token(username)
-                
-                if not access_token:
-                    raise AuthenticationError("Failed to obtain access token after authentication")
-            
-            # Search for driver using Bearer token
-            try:
-                custid = search_driver_with_auth(search_term, access_token)
-            except AuthenticationError:
-                logger.info("Authentication failed, retrying with fresh token")
-                # Token might have expired, try refreshing
-                invoke_auth_lambda()
-                access_token = get_access_token(username)
-                
-                if not access_token:
-                    raise AuthenticationError("Failed to obtain access token after re-authentication")
-                
-                custid = search_driver_with_auth(search_term, access_token)
         
-        logger.info(f"Successfully found customer ID: {custid}")
+        # Concurrent misses for the same term share one iRacing lookup
+        custid = lookup_driver_single_flight(search_term, username, custid_item, access_token)
+        
+        logger.info("Successfully found customer ID: %s", custid)
         
         return {
             'statusCode': 200,
-            'headers': {'Content-Type': 'application/json'},
-            'body': json.dumps(custid)
+            'headers': JSON_HEADERS,
+            'body': json_dumps(custid)
         }
         
     except AuthenticationError as e:
-        logger.error(f"Authentication error: {e}")
+        logger.error("Authentication error: %s", e)
         return {
             'statusCode': 401,
-            'headers': {'Content-Type': 'application/json'},
-            'body': json.dumps({
+            'headers': JSON_HEADERS,
+            'body': json_dumps({
                 'error': 'Authentication failed',
                 'message': str(e)
             })
         }
         
+    except RateLimitError as e:
+        logger.error("Rate limit error: %s", e)
+        return {
+            'statusCode': 429,
+            'headers': {
+                **JSON_HEADERS,
+                'Retry-After': str(RATE_LIMIT_WINDOW)
+            },
+            'body': json_dumps({
+                'error': 'Rate limited',
+                'message': str(e)
+            })
+        }
+        
     except APIError as e:
-        logger.error(f"API error: {e}")
+        logger.error("API error: %s", e)
         return {
             'statusCode': 502,
-            'headers': {'Content-Type': 'application/json'},
-            'body': json.dumps({
+            'headers': JSON_HEADERS,
+            'body': json_dumps({
                 'error': 'API error',
                 'message': str(e)
             })
         }
         
     except ClientError as e:
-        logger.error(f"AWS service error: {e}")
+        logger.error("AWS service error: %s", e)
         return {
             'statusCode': 503,
-            'headers': {'Content-Type': 'application/json'},
-            'body': json.dumps({
-                'error': 'Service unavailable',
-                'message': 'AWS service temporarily unavailable'
-            })
+            'headers': JSON_HEADERS,
+            'body': SERVICE_UNAVAILABLE_BODY
         }
         
     except Exception as e:
-        logger.error(f"Unexpected error: {e}")
+        logger.error("Unexpected error: %s", e)
         return {
             'statusCode': 500,
-            'headers': {'Content-Type': 'application/json'},
-            'body': json.dumps({
-                'error': 'Internal server error',
-                'message': 'An unexpected error occurred'
-            })
+            'headers': JSON_HEADERS,
+            'body': INTERNAL_ERROR_BODY
         }
 
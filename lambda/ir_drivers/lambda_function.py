@@ -1,27 +1,159 @@
 import json
-import urllib.request
-import urllib.parse
-import urllib.error
-import boto3
+import urllib3
+import botocore.session
 import logging
 import os
+import random
+import threading
 import time
-from typing import Dict, Any, Optional, List
-from botocore.exceptions import ClientError
+import urllib.parse
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Dict, Any, Optional, List, Tuple
+from botocore.config import Config
+from botocore.exceptions import ClientError, ConnectionError as BotocoreConnectionError
+
+try:
+    import orjson
+except ImportError:  # Speeds up the profile (de)serialization when bundled; the stdlib is used otherwise
+    orjson = None
+
+try:
+    import amazondax
+    from amazondax.DaxError import DaxClientError
+except ImportError:  # Only bundled into deployments that configure DAX_ENDPOINT
+    amazondax = None
+    DaxClientError = None
+
+def json_loads(data: bytes) -> Any:
+    """
+    Parse a Lambda payload, a cached profile or an iRacing response
+    
+    Args:
+        data: Raw JSON bytes or string
+        
+    Returns:
+        Parsed JSON value
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
 
-# Configure structured logging
+def json_dumps(value: Any) -> str:
+    """
+    Serialize a value to JSON text; all response bodies and fragments use this one encoder
+    
+    Args:
+        value: Value to serialize
+        
+    Returns:
+        JSON string
+    """
+    if orjson is not None:
+        return orjson.dumps(value).decode('utf-8')
+    return json.dumps(value)
+
+# Configure structured logging; LOG_LEVEL=WARNING silences the per-invocation progress logs in production
+LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO').upper()
 logger = logging.getLogger()
-logger.setLevel(logging.INFO)
+# getLevelName() maps only registered level names to numbers; anything else falls back to INFO
+# rather than failing every cold start with a ValueError
+logger.setLevel(LOG_LEVEL if isinstance(logging.getLevelName(LOG_LEVEL), int) else logging.INFO)
 
-# Initialize AWS clients
-dynamodb = boto3.client('dynamodb')
-lambda_client = boto3.client('lambda')
-secrets_client = boto3.client('secretsmanager')
+# Configuration resolved once per container; the environment does not change between invocations
+IRACING_SECRET_NAME = os.environ.get('IRACING_SECRET_NAME', 'iracing-oauth-credentials')
+IR_AUTH_TABLE_NAME = os.environ.get('IR_AUTH_TABLE_NAME', 'ir_auth')
+IR_CUSTID_TABLE_NAME = os.environ.get('IR_CUSTID_TABLE_NAME', 'ir_custid')
+IR_DRIVERS_TABLE_NAME = os.environ.get('IR_DRIVERS_TABLE_NAME', 'ir_drivers')
+IR_AUTH_FUNCTION_ARN = os.environ.get('IR_AUTH_FUNCTION_ARN', 'ir_auth')
+IR_CUSTID_FUNCTION_ARN = os.environ.get('IR_CUSTID_FUNCTION_ARN', 'ir_custid')
+DAX_ENDPOINT = os.environ.get('DAX_ENDPOINT')
 
 # Constants
 MAX_RETRIES = 3
 BASE_BACKOFF_DELAY = 1  # seconds
+MAX_BACKOFF = 8  # seconds; caps a single retry wait within the Lambda timeout
 CACHE_TTL_SECONDS = 3600  # 1 hour
+PROFILE_COMPRESSION_LEVEL = 6  # zlib level for cached profiles; JSON shrinks several times over
+BATCH_GET_NAMES = 50  # names per BatchGetItem; each name is looked up in two tables and the limit is 100 keys
+BATCH_WRITE_LIMIT = 25  # puts per BatchWriteItem request
+MAX_WORKERS = 16  # drivers processed concurrently
+CUSTID_BATCH_SIZE = 4  # names per ir_custid invoke, matching the lookups one ir_custid invocation runs at once
+CREDENTIALS_CACHE_TTL = 3600  # seconds a warm container reuses the decoded secret
+TOKEN_CACHE_MARGIN = 60  # seconds before the stored token expiry at which the cached copy is dropped
+
+# Initialize AWS clients from a bare botocore session; importing boto3 only adds cold-start time
+# Every driver thread may hold a connection at once, so the pools are sized to the worker count
+aws_client_config = Config(tcp_keepalive=True, max_pool_connections=MAX_WORKERS)
+aws_session = botocore.session.get_session()
+dynamodb = aws_session.create_client('dynamodb', config=aws_client_config)
+lambda_client = aws_session.create_client('lambda', config=aws_client_config)
+secrets_client = aws_session.create_client('secretsmanager', config=aws_client_config)
+
+# The ir_drivers profile table is read and written through DAX when a cluster endpoint is configured
+# and the client is available. ir_auth and ir_custid are written by the other functions straight to
+# DynamoDB, so DAX would keep serving their stale tokens and misses; they are always read directly.
+dax_client = None
+# Only failures to reach the cluster fall back to DynamoDB; errors DynamoDB itself returns propagate
+DAX_CONNECTION_ERRORS: Tuple[type, ...] = (OSError, BotocoreConnectionError)
+if DaxClientError is not None:
+    DAX_CONNECTION_ERRORS += (DaxClientError,)
+if DAX_ENDPOINT and amazondax is not None:
+    try:
+        dax_client = amazondax.AmazonDaxClient(endpoint_url=DAX_ENDPOINT)
+    except Exception as e:
+        logger.warning("Failed to create DAX client, using DynamoDB directly: %s", e)
+
+# Reused across warm invocations and driver threads so the iRacing API and S3 TLS sessions are not re-established each time;
+# one keep-alive connection per worker and host, and a worker waits for a free one instead of opening a throwaway socket
+http_pool = urllib3.PoolManager(
+    num_pools=2,
+    maxsize=MAX_WORKERS,
+    block=True,
+    retries=False,
+    timeout=urllib3.Timeout(connect=5, read=30)
+)
+
+# Module-level caches reused across warm invocations of the same sandbox
+_CREDS_CACHE: Dict[str, Any] = {'value': None, 'expires': 0.0}
+_TOKEN_CACHE: Dict[str, Any] = {'username': None, 'value': None, 'expires': 0}
+
+# iRacing request templates; S3 links use signed URL authentication, so only the API call adds a bearer token
+PROFILE_URL = "https://members-ng.iracing.com/data/member/profile?cust_id={}"
+BASE_HEADERS = {
+    'User-Agent': 'iRacing-Lambda-Drivers/1.0',
+    'Content-Type': 'application/json'
+}
+
+# Invariant payloads built once per container instead of on every invocation
+EMPTY_PAYLOAD = b"{}"
+CORS_HEADERS = {
+    'Content-Type': 'application/json',
+    'Access-Control-Allow-Headers': 'Content-Type',
+    'Access-Control-Allow-Origin': '*',
+    'Access-Control-Allow-Methods': 'GET'
+}
+NAMES_REQUIRED_BODY = json_dumps({
+    'error': 'Bad Request',
+    'message': 'Driver names are required in query parameter "names"'
+})
+INVALID_QUERY_BODY = json_dumps({
+    'error': 'Bad Request',
+    'message': 'Invalid query parameters'
+})
+SERVICE_UNAVAILABLE_BODY = json_dumps({
+    'error': 'Service unavailable',
+    'message': 'AWS service temporarily unavailable'
+})
+INTERNAL_ERROR_BODY = json_dumps({
+    'error': 'Internal server error',
+    'message': 'An unexpected error occurred'
+})
+
+# Serializes token refreshes so a burst of 401s from parallel drivers invokes ir_auth once
+_token_lock = threading.Lock()
+_refreshed_tokens: Dict[str, str] = {}
 
 class AuthenticationError(Exception):
     """Custom exception for authentication failures"""
@@ -31,9 +163,29 @@ class APIError(Exception):
     """Custom exception for iRacing API failures"""
     pass
 
+def cache_request(operation: str, **kwargs) -> Dict[str, Any]:
+    """
+    Call a DynamoDB operation through DAX, falling back to DynamoDB if DAX is unreachable
+    
+    Only use this for requests that touch the ir_drivers table alone.
+    
+    Args:
+        operation: Client method name, e.g. 'get_item'
+        **kwargs: Operation parameters
+        
+    Returns:
+        Operation response
+    """
+    if dax_client is not None:
+        try:
+            return getattr(dax_client, operation)(**kwargs)
+        except DAX_CONNECTION_ERRORS as e:
+            logger.warning("DAX %s failed, falling back to DynamoDB: %s", operation, e)
+    return getattr(dynamodb, operation)(**kwargs)
+
 def get_oauth_credentials() -> Dict[str, str]:
     """
-    Retrieve OAuth credentials from Secrets Manager
+    Retrieve OAuth credentials from Secrets Manager, cached for CREDENTIALS_CACHE_TTL
     
     Returns:
         Dict containing username for token lookup
@@ -41,65 +193,76 @@ def get_oauth_credentials() -> Dict[str, str]:
     Raises:
         ClientError: If secret retrieval fails
     """
+    if _CREDS_CACHE['value'] is not None and time.monotonic() < _CREDS_CACHE['expires']:
+        return _CREDS_CACHE['value']
+    
     try:
-        secret_name = os.environ.get('IRACING_SECRET_NAME', 'iracing-oauth-credentials')
-        response = secrets_client.get_secret_value(SecretId=secret_name)
-        credentials = json.loads(response['SecretString'])
+        response = secrets_client.get_secret_value(SecretId=IRACING_SECRET_NAME)
+        credentials = json_loads(response['SecretString'])
         
         if 'username' not in credentials:
             raise ValueError("Missing required credential: username")
                 
         logger.info("Successfully retrieved OAuth credentials from Secrets Manager")
+        _CREDS_CACHE['value'] = credentials
+        _CREDS_CACHE['expires'] = time.monotonic() + CREDENTIALS_CACHE_TTL
         return credentials
         
     except ClientError as e:
-        logger.error(f"Failed to retrieve credentials from Secrets Manager: {e}")
+        logger.error("Failed to retrieve credentials from Secrets Manager: %s", e)
         raise
     except json.JSONDecodeError as e:
-        logger.error(f"Invalid JSON in secret: {e}")
+        logger.error("Invalid JSON in secret: %s", e)
         raise
     except Exception as e:
-        logger.error(f"Unexpected error retrieving credentials: {e}")
+        logger.error("Unexpected error retrieving credentials: %s", e)
         raise
 
-def get_access_token(username: str) -> Optional[str]:
+def get_access_token(username: str, consistent: bool = False) -> Optional[str]:
     """
-    Retrieve valid access token from DynamoDB
+    Retrieve valid access token from DynamoDB, cached until shortly before it expires
     
     Args:
         username: Username to lookup tokens for
+        consistent: Use a strongly consistent read, e.g. right after ir_auth stored a new token
         
     Returns:
         Access token if valid, None otherwise
     """
+    current_time = int(time.time())
+    if (not consistent and _TOKEN_CACHE['value'] is not None and _TOKEN_CACHE['username'] == username
+            and current_time < _TOKEN_CACHE['expires']):
+        return _TOKEN_CACHE['value']
+    
     try:
-        table_name = os.environ.get('IR_AUTH_TABLE_NAME', 'ir_auth')
         response = dynamodb.get_item(
-            TableName=table_name,
-            Key={'username': {'S': username}}
+            TableName=IR_AUTH_TABLE_NAME,
+            Key={'username': {'S': username}},
+            ConsistentRead=consistent
         )
         
         if 'Item' in response:
             item = response['Item']
-            current_time = int(time.time())
             
             # Check if access token is still valid
             ttl = int(item.get('ttl', {}).get('N', '0'))
             if ttl > current_time:
                 access_token = item['access_token']['S']
-                logger.info(f"Found valid access token for user {username}")
+                logger.info("Found valid access token for user %s", username)
+                _TOKEN_CACHE.update(username=username, value=access_token,
+                                    expires=ttl - TOKEN_CACHE_MARGIN)
                 return access_token
             else:
-                logger.info(f"Access token expired for user {username}")
+                logger.info("Access token expired for user %s", username)
         
-        logger.info(f"No valid access token found for user {username}")
+        logger.info("No valid access token found for user %s", username)
         return None
         
     except ClientError as e:
-        logger.error(f"Failed to retrieve access token from DynamoDB: {e}")
+        logger.error("Failed to retrieve access token from DynamoDB: %s", e)
         return None
     except Exception as e:
-        logger.error(f"Unexpected error retrieving access token: {e}")
+        logger.error("Unexpected error retrieving access token: %s", e)
         return None
 
 def invoke_auth_lambda() -> None:
@@ -112,25 +275,25 @@ def invoke_auth_lambda() -> None:
     try:
         logger.info("Invoking ir_auth Lambda for token refresh")
         response = lambda_client.invoke(
-            FunctionName=os.environ.get('IR_AUTH_FUNCTION_ARN', 'ir_auth'),
+            FunctionName=IR_AUTH_FUNCTION_ARN,
             InvocationType='RequestResponse',
-            Payload=json.dumps({})
+            Payload=EMPTY_PAYLOAD
         )
         
         if response['StatusCode'] != 200:
             raise AuthenticationError(f"ir_auth Lambda returned status {response['StatusCode']}")
             
-        payload = json.loads(response['Payload'].read())
+        payload = json_loads(response['Payload'].read())
         if payload.get('statusCode') != 200:
             raise AuthenticationError(f"ir_auth Lambda failed: {payload.get('body', 'Unknown error')}")
             
         logger.info("Successfully invoked ir_auth Lambda")
         
     except ClientError as e:
-        logger.error(f"Failed to invoke ir_auth Lambda: {e}")
+        logger.error("Failed to invoke ir_auth Lambda: %s", e)
         raise AuthenticationError(f"Failed to invoke authentication: {e}")
     except Exception as e:
-        logger.error(f"Unexpected error invoking ir_auth Lambda: {e}")
+        logger.error("Unexpected error invoking ir_auth Lambda: %s", e)
         raise AuthenticationError(f"Authentication invocation failed: {e}")
 
 def invoke_custid_lambda(driver_name: str) -> Optional[str]:
@@ -147,34 +310,174 @@ def invoke_custid_lambda(driver_name: str) -> Optional[str]:
         APIError: If invocation fails
     """
     try:
-        logger.info(f"Invoking ir_custid Lambda for driver: {driver_name}")
-        payload = {"rawQueryString": driver_name}
+        logger.debug("Invoking ir_custid Lambda for driver: %s", driver_name)
+        # ir_custid unquotes rawQueryString as API Gateway sends it, so encode the name the same way;
+        # otherwise a name containing '%' would resolve differently than through the batch path
+        payload = {"rawQueryString": urllib.parse.quote(driver_name)}
         response = lambda_client.invoke(
-            FunctionName=os.environ.get('IR_CUSTID_FUNCTION_ARN', 'ir_custid'),
+            FunctionName=IR_CUSTID_FUNCTION_ARN,
             InvocationType='RequestResponse',
-            Payload=json.dumps(payload)
+            Payload=json_dumps(payload)
         )
         
         if response['StatusCode'] != 200:
             raise APIError(f"ir_custid Lambda returned status {response['StatusCode']}")
             
-        response_payload = json.loads(response['Payload'].read())
+        response_payload = json_loads(response['Payload'].read())
         if response_payload.get('statusCode') != 200:
             raise APIError(f"ir_custid Lambda failed: {response_payload.get('body', 'Unknown error')}")
             
-        body = json.loads(response_payload['body'])
+        body = json_loads(response_payload['body'])
         custid = body.get('custid', '0')
         
-        logger.info(f"Successfully got customer ID for {driver_name}: {custid}")
+        logger.debug("Got customer ID for %s: %s", driver_name, custid)
         return custid
         
     except ClientError as e:
-        logger.error(f"Failed to invoke ir_custid Lambda: {e}")
+        logger.error("Failed to invoke ir_custid Lambda: %s", e)
         raise APIError(f"Failed to invoke customer ID lookup: {e}")
     except Exception as e:
-        logger.error(f"Unexpected error invoking ir_custid Lambda: {e}")
+        logger.error("Unexpected error invoking ir_custid Lambda: %s", e)
         raise APIError(f"Customer ID lookup failed: {e}")
 
+def invoke_custid_lambda_batch(driver_names: List[str]) -> Dict[str, str]:
+    """
+    Invoke ir_custid Lambda function once to get customer IDs for a batch of drivers
+    
+    Args:
+        driver_names: Names of drivers to lookup
+        
+    Returns:
+        Customer IDs keyed by driver name, '0' for drivers that were not found;
+        drivers whose lookup failed are missing
+        
+    Raises:
+        APIError: If invocation fails
+    """
+    try:
+        logger.info("Invoking ir_custid Lambda for %s drivers", len(driver_names))
+        response = lambda_client.invoke(
+            FunctionName=IR_CUSTID_FUNCTION_ARN,
+            InvocationType='RequestResponse',
+            Payload=json_dumps({"names": driver_names})
+        )
+        
+        if response['StatusCode'] != 200:
+            raise APIError(f"ir_custid Lambda returned status {response['StatusCode']}")
+            
+        response_payload = json_loads(response['Payload'].read())
+        if response_payload.get('statusCode') != 200:
+            raise APIError(f"ir_custid Lambda failed: {response_payload.get('body', 'Unknown error')}")
+        
+        return json_loads(response_payload['body'])
+        
+    except ClientError as e:
+        logger.error("Failed to invoke ir_custid Lambda: %s", e)
+        raise APIError(f"Failed to invoke customer ID lookup: {e}")
+    except Exception as e:
+        logger.error("Unexpected error invoking ir_custid Lambda: %s", e)
+        raise APIError(f"Customer ID lookup failed: {e}")
+
+def get_backoff_delay(attempt: int) -> float:
+    """
+    Compute a full-jitter exponential backoff delay
+    
+    Randomizing over the whole window keeps parallel driver threads from
+    retrying against iRacing in lockstep after a shared rate limit.
+    
+    Args:
+        attempt: Zero-based attempt number that just failed
+        
+    Returns:
+        Seconds to wait before the next attempt
+    """
+    return min(random.uniform(0, BASE_BACKOFF_DELAY * (2 ** attempt)), MAX_BACKOFF)
+
+def get_rate_limit_delay(response: urllib3.HTTPResponse, attempt: int) -> float:
+    """
+    Compute the wait after a 429, preferring the server's own hint over backoff
+    
+    Args:
+        response: The 429 response from iRacing
+        attempt: Zero-based attempt number that just failed
+        
+    Returns:
+        Seconds to wait before the next attempt, capped at MAX_BACKOFF
+    """
+    retry_after = response.headers.get('Retry-After', '')
+    if retry_after.isdigit():
+        return min(float(retry_after), MAX_BACKOFF)
+    reset_at = response.headers.get('x-ratelimit-reset', '')
+    if reset_at.isdigit():
+        return min(max(float(reset_at) - time.time(), 0.0), MAX_BACKOFF)
+    return get_backoff_delay(attempt)
+
+def request_with_retries(url: str, headers: Dict[str, str], description: str) -> Any:
+    """
+    GET a JSON document with jittered exponential backoff
+    
+    Args:
+        url: URL to request
+        headers: Request headers
+        description: Name of the request used in log and error messages
+        
+    Returns:
+        Parsed JSON response
+        
+    Raises:
+        APIError: If the request keeps failing after MAX_RETRIES attempts
+        AuthenticationError: If the request is rejected with 401
+    """
+    for attempt in range(MAX_RETRIES):
+        try:
+            response = http_pool.request('GET', url, headers=headers)
+        except urllib3.exceptions.HTTPError as e:
+            logger.error("Connection error on attempt %s: %s", attempt + 1, e)
+            failure = APIError(f"{description} failed after {attempt + 1} attempts: {e}")
+            backoff_delay = get_backoff_delay(attempt)
+        else:
+            if response.status == 200:
+                try:
+                    return json_loads(response.data)
+                except json.JSONDecodeError as e:
+                    logger.error("Invalid JSON response on attempt %s: %s", attempt + 1, e)
+                    failure = APIError(f"Invalid JSON response after {attempt + 1} attempts: {e}")
+                    backoff_delay = get_backoff_delay(attempt)
+            elif response.status == 401:
+                logger.error("Authentication failed on %s - token may be expired", description.lower())
+                raise AuthenticationError("Access token expired or invalid")
+            elif response.status == 429:
+                logger.warning("Rate limited by iRacing API")
+                failure = APIError("Rate limited after maximum retries")
+                backoff_delay = get_rate_limit_delay(response, attempt)
+            else:
+                logger.error("%s failed: %s", description, response.status)
+                failure = APIError(f"{description} failed: {response.status}")
+                backoff_delay = get_backoff_delay(attempt)
+        
+        if attempt < MAX_RETRIES - 1:
+            logger.info("Retrying in %.2f seconds", backoff_delay)
+            time.sleep(backoff_delay)
+            continue
+        raise failure
+    
+    raise APIError("Max retries exceeded")
+
+@lru_cache(maxsize=2)
+def get_auth_headers(access_token: str) -> Dict[str, str]:
+    """
+    Build the iRacing API request headers for a token, shared by every driver using it
+    
+    The returned dict is cached and must not be modified.
+    
+    Args:
+        access_token: OAuth access token
+        
+    Returns:
+        Request headers including the bearer token
+    """
+    return {'Authorization': 'Bearer ' + access_token, **BASE_HEADERS}
+
 def get_driver_profile_with_auth(cust_id: str, access_token: str) -> Dict[str, Any]:
     """
     Get driver profile using Bearer token authentication
@@ -190,290 +493,284 @@ def get_driver_profile_with_auth(cust_id: str, access_token: str) -> Dict[str, A
         APIError: If API request fails
         AuthenticationError: If authentication fails
     """
-    headers = {
-        'Authorization': f'Bearer {access_token}',
-        'User-Agent': 'iRacing-Lambda-Drivers/1.0',
-        'Content-Type': 'application/json'
-    }
+    headers = get_auth_headers(access_token)
     
-    for attempt in range(MAX_RETRIES):
-        try:
-            logger.info(f"Getting driver profile for customer ID {cust_id} (attempt {attempt + 1}/{MAX_RETRIES})")
-            
-            # First request to get the profile link
-            profile_url = f"https://members-ng.iracing.com/data/member/profile?cust_id={cust_id}"
-            
-            # Create request with headers
-            req = urllib.request.Request(profile_url, headers=headers)
-            
-            try:
-                with urllib.request.urlopen(req, timeout=30) as response:
-                    if response.status == 401:
-                        logger.error("Authentication failed - token may be expired")
-                        raise AuthenticationError("Access token expired or invalid")
-                    elif response.status == 429:
-                        logger.warning("Rate limited by iRacing API")
-                        if attempt < MAX_RETRIES - 1:
-                            backoff_delay = BASE_BACKOFF_DELAY * (2 ** attempt)
-                            logger.info(f"Retrying in {backoff_delay} seconds")
-                            time.sleep(backoff_delay)
-                            continue
-                        else:
-                            raise APIError("Rate limited after maximum retries")
-                    elif response.status != 200:
-                        logger.error(f"Profile request failed: {response.status}")
-                        if attempt < MAX_RETRIES - 1:
-                            backoff_delay = BASE_BACKOFF_DELAY * (2 ** attempt)
-                            logger.info(f"Retrying in {backoff_delay} seconds")
-                            time.sleep(backoff_delay)
-                            continue
-                        else:
-                            raise APIError(f"Profile request failed: {response.status}")
-                    
-                    profile_data = json.loads(response.read().decode('utf-8'))
-                    
-            except urllib.error.HTTPError as e:
-                if e.code == 401:
-                    logger.error("Authentication failed - token may be expired")
-                    raise AuthenticationError("Access token expired or invalid")
-                elif e.code == 429:
-                    logger.warning("Rate limited by iRacing API")
-                    if attempt < MAX_RETRIES - 1:
-                        backoff_delay = BASE_BACKOFF_DELAY * (2 ** attempt)
-                        logger.info(f"Retrying in {backoff_delay} seconds")
-                        time.sleep(backoff_delay)
-                        continue
-                    else:
-                        raise APIError("Rate limited after maximum retries")
-                else:
-                    logger.error(f"Profile request failed: {e.code}")
-                    if attempt < MAX_RETRIES - 1:
-                        backoff_delay = BASE_BACKOFF_DELAY * (2 ** attempt)
-                        logger.info(f"Retrying in {backoff_delay} seconds")
-                        time.sleep(backoff_delay)
-                        continue
-                    else:
-                        raise APIError(f"Profile request failed: {e.code}")
-            
-            if 'link' not in profile_data:
-                logger.error("No link found in profile response")
-                raise APIError("Invalid profile response format")
-            
-            # Second request to get the actual profile data
-            profile_detail_url = profile_data['link']
-            # S3 URLs don't need Authorization header - they use signed URL authentication
-            s3_headers = {
-                'User-Agent': 'iRacing-Lambda-Drivers/1.0',
-                'Content-Type': 'application/json'
-            }
-            detail_req = urllib.request.Request(profile_detail_url, headers=s3_headers)
-            
-            try:
-                with urllib.request.urlopen(detail_req, timeout=30) as response:
-                    if response.status == 401:
-                        logger.error("Authentication failed on profile detail request")
-                        raise AuthenticationError("Access token expired or invalid")
-                    elif response.status != 200:
-                        logger.error(f"Profile detail request failed: {response.status}")
-                        if attempt < MAX_RETRIES - 1:
-                            backoff_delay = BASE_BACKOFF_DELAY * (2 ** attempt)
-                            logger.info(f"Retrying in {backoff_delay} seconds")
-                            time.sleep(backoff_delay)
-                            continue
-                        else:
-                            raise APIError(f"Profile detail request failed: {response.status}")
-                    
-                    driver_profile = json.loads(response.read().decode('utf-8'))
-                    logger.info(f"Successfully retrieved profile for customer ID {cust_id}")
-                    return driver_profile
-                    
-            except urllib.error.HTTPError as e:
-                if e.code == 401:
-                    logger.error("Authentication failed on profile detail request")
-                    raise AuthenticationError("Access token expired or invalid")
-                else:
-                    logger.error(f"Profile detail request failed: {e.code}")
-                    if attempt < MAX_RETRIES - 1:
-                        backoff_delay = BASE_BACKOFF_DELAY * (2 ** attempt)
-                        logger.info(f"Retrying in {backoff_delay} seconds")
-                        time.sleep(backoff_delay)
-                        continue
-                    else:
-                        raise APIError(f"Profile detail request failed: {e.code}")
-            
-        except urllib.error.URLError as e:
-            logger.error(f"URL error on attempt {attempt + 1}: {e}")
-            if attempt < MAX_RETRIES - 1:
-                backoff_delay = BASE_BACKOFF_DELAY * (2 ** attempt)
-                logger.info(f"Retrying in {backoff_delay} seconds")
-                time.sleep(backoff_delay)
-                continue
-            else:
-                raise APIError(f"Request failed after {MAX_RETRIES} attempts: {e}")
-        except json.JSONDecodeError as e:
-            logger.error(f"Invalid JSON response on attempt {attempt + 1}: {e}")
-            if attempt < MAX_RETRIES - 1:
-                backoff_delay = BASE_BACKOFF_DELAY * (2 ** attempt)
-                logger.info(f"Retrying in {backoff_delay} seconds")
-                time.sleep(backoff_delay)
-                continue
-            else:
-                raise APIError(f"Invalid JSON response after {MAX_RETRIES} attempts: {e}")
+    # First request to get the profile link
+    profile_data = request_with_retries(PROFILE_URL.format(cust_id), headers, "Profile request")
     
-    raise APIError("Max retries exceeded")
+    if 'link' not in profile_data:
+        logger.error("No link found in profile response")
+        raise APIError("Invalid profile response format")
+    
+    # Second request to get the actual profile data
+    driver_profile = request_with_retries(profile_data['link'], BASE_HEADERS, "Profile detail request")
+    logger.debug("Retrieved profile for customer ID %s", cust_id)
+    return driver_profile
 
-def cache_driver_profile(name: str, profile: Dict[str, Any]) -> None:
+def cache_driver_profiles(profiles: Dict[str, str]) -> None:
     """
-    Cache driver profile in DynamoDB with TTL
+    Cache driver profiles in DynamoDB with TTL using BatchWriteItem
+    
+    Profiles are stored zlib-compressed in a binary attribute to keep items small.
     
     Args:
-        name: Driver name
-        profile: Driver profile data
+        profiles: Serialized driver profiles keyed by driver name
     """
-    try:
-        current_time = int(time.time())
-        ttl = current_time + CACHE_TTL_SECONDS
-        
-        table_name = os.environ.get('IR_DRIVERS_TABLE_NAME', 'ir_drivers')
-        response = dynamodb.put_item(
-            TableName=table_name,
-            Item={
-                'name': {'S': str(name)},
-                'profile': {'S': json.dumps(profile)},
-                'ttl': {'N': str(ttl)}
-            }
-        )
-        logger.info(f"Cached driver profile: {name} (TTL: {ttl})")
+    current_time = int(time.time())
+    ttl = current_time + CACHE_TTL_SECONDS
+    items = [
+        {
+            'name': {'S': str(name)},
+            'profile_z': {'B': zlib.compress(profile.encode('utf-8'), PROFILE_COMPRESSION_LEVEL)},
+            'ttl': {'N': str(ttl)}
+        }
+        for name, profile in profiles.items()
+    ]
+    
+    for start in range(0, len(items), BATCH_WRITE_LIMIT):
+        request_items = {
+            IR_DRIVERS_TABLE_NAME: [{'PutRequest': {'Item': item}} for item in items[start:start + BATCH_WRITE_LIMIT]]
+        }
         
-    except ClientError as e:
-        logger.error(f"Failed to cache driver profile: {e}")
-        # Don't raise - caching failure shouldn't break the main flow
+        try:
+            for attempt in range(MAX_RETRIES):
+                # Written through DAX so its item cache does not keep serving the earlier miss
+                response = cache_request('batch_write_item', RequestItems=request_items)
+                request_items = response.get('UnprocessedItems')
+                if not request_items:
+                    break
+                backoff_delay = BASE_BACKOFF_DELAY * (2 ** attempt) / 10
+                logger.info("Retrying unprocessed profile writes in %s seconds", backoff_delay)
+                time.sleep(backoff_delay)
+            else:
+                logger.warning("Unprocessed profile writes remain after maximum retries; those drivers stay uncached")
+                
+        except ClientError as e:
+            logger.error("Failed to cache driver profiles: %s", e)
+            # Don't raise - caching failure shouldn't break the main flow
+    
+    logger.info("Cached %s driver profiles (TTL: %s)", len(items), ttl)
 
-def get_cached_driver_profile(name: str) -> Optional[Dict[str, Any]]:
+def parse_cached_profile(name: str, item: Dict[str, Any], current_time: int) -> Optional[str]:
     """
-    Get cached driver profile from DynamoDB
+    Decode a cached driver profile item if it has not expired
+    
+    The profile is returned as the JSON text it was stored as, so it can be copied
+    into the response body as is. It is parsed once here to reject a corrupt item,
+    which is treated as a cache miss rather than spliced into the response.
     
     Args:
-        name: Driver name to lookup
+        name: Driver name the item belongs to
+        item: ir_drivers DynamoDB item
+        current_time: Epoch seconds to compare the TTL against
         
     Returns:
-        Cached profile if found and valid, None otherwise
+        Cached profile JSON if valid, None otherwise
     """
+    # TTL is handled automatically by DynamoDB, but we can check manually too
+    ttl = int(item.get('ttl', {}).get('N', '0'))
+    if ttl <= current_time:
+        logger.debug("Cached profile expired for driver: %s", name)
+        return None
+    
     try:
-        table_name = os.environ.get('IR_DRIVERS_TABLE_NAME', 'ir_drivers')
-        response = dynamodb.get_item(
-            TableName=table_name,
-            Key={'name': {'S': str(name)}}
-        )
-        
-        if 'Item' in response:
-            # TTL is handled automatically by DynamoDB, but we can check manually too
-            current_time = int(time.time())
-            ttl = int(response['Item'].get('ttl', {}).get('N', '0'))
-            
-            if ttl > current_time:
-                profile_json = response['Item']['profile']['S']
-                profile = json.loads(profile_json)
-                logger.info(f"Found cached profile for driver: {name}")
-                return profile
-            else:
-                logger.info(f"Cached profile expired for driver: {name}")
-        
+        # Items written before compression was introduced hold the JSON string in 'profile'
+        if 'profile_z' in item:
+            profile = zlib.decompress(item['profile_z']['B']).decode('utf-8')
+        else:
+            profile = item['profile']['S']
+        json_loads(profile)
+        logger.debug("Found cached profile for driver: %s", name)
+        return profile
+    # JSON and UTF-8 decode errors are both ValueErrors, for the stdlib parser and orjson alike
+    except (KeyError, zlib.error, ValueError) as e:
+        logger.error("Invalid cached profile for driver %s: %s", name, e)
         return None
+
+def batch_get_items(request_items: Dict[str, Any], through_dax: bool) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Run a BatchGetItem request, retrying unprocessed keys
+    
+    Args:
+        request_items: BatchGetItem RequestItems
+        through_dax: Read through cache_request(); only for requests on the ir_drivers table alone
         
-    except ClientError as e:
-        logger.error(f"Failed to get cached driver profile: {e}")
-        return None
-    except json.JSONDecodeError as e:
-        logger.error(f"Invalid JSON in cached profile: {e}")
-        return None
-    except Exception as e:
-        logger.error(f"Unexpected error getting cached profile: {e}")
-        return None
+    Returns:
+        Items read, keyed by table name
+        
+    Raises:
+        ClientError: If DynamoDB rejects the request
+    """
+    items: Dict[str, List[Dict[str, Any]]] = {}
+    
+    for attempt in range(MAX_RETRIES):
+        if through_dax:
+            response = cache_request('batch_get_item', RequestItems=request_items)
+        else:
+            response = dynamodb.batch_get_item(RequestItems=request_items)
+        for table, table_items in response.get('Responses', {}).items():
+            items.setdefault(table, []).extend(table_items)
+        
+        request_items = response.get('UnprocessedKeys')
+        if not request_items:
+            break
+        backoff_delay = BASE_BACKOFF_DELAY * (2 ** attempt) / 10
+        logger.info("Retrying unprocessed cache keys in %s seconds", backoff_delay)
+        time.sleep(backoff_delay)
+    else:
+        logger.warning("Unprocessed cache keys remain after maximum retries; treating them as misses")
+    
+    return items
 
-def get_customer_id_from_cache(name: str) -> Optional[str]:
+def prefetch_caches(names: List[str]) -> Tuple[Dict[str, str], Dict[str, str]]:
     """
-    Get customer ID from cache
+    Look up cached profiles and customer IDs for all drivers with BatchGetItem
     
     Args:
-        name: Driver name to lookup
+        names: Driver names
         
     Returns:
-        Customer ID if found, None otherwise
+        Tuple of valid cached profile JSON and cached customer IDs, each keyed by driver name
     """
-    try:
-        table_name = os.environ.get('IR_CUSTID_TABLE_NAME', 'ir_custid')
-        response = dynamodb.get_item(
-            TableName=table_name,
-            Key={'name': {'S': name}}
-        )
+    # BatchGetItem rejects duplicate keys
+    names = list(dict.fromkeys(names))
+    profile_cache: Dict[str, str] = {}
+    custid_cache: Dict[str, str] = {}
+    current_time = int(time.time())
+    
+    for start in range(0, len(names), BATCH_GET_NAMES):
+        keys = [{'name': {'S': name}} for name in names[start:start + BATCH_GET_NAMES]]
+        if dax_client is None:
+            # Without DAX both tables are read in the same request
+            reads = [({IR_DRIVERS_TABLE_NAME: {'Keys': keys}, IR_CUSTID_TABLE_NAME: {'Keys': keys}}, False)]
+        else:
+            reads = [({IR_DRIVERS_TABLE_NAME: {'Keys': keys}}, True), ({IR_CUSTID_TABLE_NAME: {'Keys': keys}}, False)]
         
-        if 'Item' in response:
-            custid = response['Item']['cust_id']['N']
-            logger.info(f"Found cached customer ID for {name}: {custid}")
-            return custid
+        try:
+            responses: Dict[str, List[Dict[str, Any]]] = {}
+            for request_items, through_dax in reads:
+                responses.update(batch_get_items(request_items, through_dax))
+            
+            for item in responses.get(IR_DRIVERS_TABLE_NAME, []):
+                name = item['name']['S']
+                profile = parse_cached_profile(name, item, current_time)
+                if profile is not None:
+                    profile_cache[name] = profile
+            
+            # ir_custid items may hold only a cached search link, without a customer ID
+            for item in responses.get(IR_CUSTID_TABLE_NAME, []):
+                if 'cust_id' in item:
+                    custid_cache[item['name']['S']] = item['cust_id']['N']
+                
+        except ClientError as e:
+            logger.error("Failed to prefetch cached drivers: %s", e)
+            # Don't raise - a cache failure only means the drivers are looked up again
+    
+    logger.info("Prefetched %s cached profiles and %s customer IDs", len(profile_cache), len(custid_cache))
+    return profile_cache, custid_cache
+
+def refresh_access_token(username: str, stale_token: str) -> str:
+    """
+    Replace an access token rejected by iRacing, sharing the refresh between threads
+    
+    Args:
+        username: OAuth username for token lookup
+        stale_token: Access token that was rejected
         
-        return None
+    Returns:
+        Fresh access token
         
-    except ClientError as e:
-        logger.error(f"Failed to get cached customer ID: {e}")
-        return None
-    except Exception as e:
-        logger.error(f"Unexpected error getting cached customer ID: {e}")
-        return None
+    Raises:
+        AuthenticationError: If no token can be obtained after re-authentication
+    """
+    with _token_lock:
+        # Another thread already refreshed this token while we were waiting
+        if stale_token in _refreshed_tokens:
+            return _refreshed_tokens[stale_token]
+        
+        # The cached token is the one iRacing just rejected
+        _TOKEN_CACHE['value'] = None
+        invoke_auth_lambda()
+        new_access_token = get_access_token(username, consistent=True)
+        
+        if not new_access_token:
+            raise AuthenticationError("Failed to obtain access token after re-authentication")
+        
+        _refreshed_tokens.clear()
+        _refreshed_tokens[stale_token] = new_access_token
+        return new_access_token
 
-def process_driver(name: str, username: str, access_token: str) -> Dict[str, Any]:
+def process_driver(name: str, username: str, access_token: str,
+                   cached_profile: Optional[str] = None,
+                   cached_custid: Optional[str] = None,
+                   fetched_profiles: Optional[Dict[str, str]] = None) -> str:
     """
     Process a single driver - get profile with caching
     
+    The result is serialized here, on the driver's worker thread, so the same
+    JSON text feeds both the cache write and the response body.
+    
     Args:
         name: Driver name
         username: OAuth username for token lookup
         access_token: OAuth access token
+        cached_profile: Profile JSON found by prefetch_caches(), if any
+        cached_custid: Customer ID found by prefetch_caches() or the batch ir_custid lookup, if any
+        fetched_profiles: Collects profile JSON fetched from iRacing for the caller to cache
         
     Returns:
-        Driver profile data or error message
+        Driver profile or error message as JSON text
     """
     try:
         # Check cache first
-        cached_profile = get_cached_driver_profile(name)
         if cached_profile:
             return cached_profile
         
         # Get customer ID from cache or via ir_custid Lambda
-        cust_id = get_customer_id_from_cache(name)
+        cust_id = cached_custid
         if not cust_id:
             cust_id = invoke_custid_lambda(name)
         
         if not cust_id or int(cust_id) <= 0:
-            logger.warning(f"No valid customer ID found for driver: {name}")
-            return {"error": f"Driver not found: {name}"}
+            logger.warning("No valid customer ID found for driver: %s", name)
+            return json_dumps({"error": f"Driver not found: {name}"})
+        
+        # Drivers starting after another thread's refresh skip the token iRacing already rejected
+        access_token = _refreshed_tokens.get(access_token, access_token)
         
         # Get driver profile with authentication retry logic
         try:
             profile = get_driver_profile_with_auth(cust_id, access_token)
-            cache_driver_profile(name, profile)
-            return profile
             
         except AuthenticationError:
-            logger.info(f"Authentication failed for {name}, retrying with fresh token")
+            logger.info("Authentication failed for %s, retrying with fresh token", name)
             # Token might have expired, try refreshing
-            invoke_auth_lambda()
-            new_access_token = get_access_token(username)
-            
-            if not new_access_token:
-                raise AuthenticationError("Failed to obtain access token after re-authentication")
-            
+            new_access_token = refresh_access_token(username, access_token)
             profile = get_driver_profile_with_auth(cust_id, new_access_token)
-            cache_driver_profile(name, profile)
-            return profile
+        
+        profile_json = json_dumps(profile)
+        if fetched_profiles is not None:
+            fetched_profiles[name] = profile_json
+        return profile_json
             
     except (APIError, AuthenticationError) as e:
-        logger.error(f"Failed to process driver {name}: {e}")
-        return {"error": f"iRacing API error for {name}: {str(e)}"}
+        logger.error("Failed to process driver %s: %s", name, e)
+        return json_dumps({"error": f"iRacing API error for {name}: {str(e)}"})
     except Exception as e:
-        logger.error(f"Unexpected error processing driver {name}: {e}")
-        return {"error": f"Unexpected error for {name}: {str(e)}"}
+        logger.error("Unexpected error processing driver %s: %s", name, e)
+        return json_dumps({"error": f"Unexpected error for {name}: {str(e)}"})
+
+def build_drivers_body(drivers_info: Dict[str, str]) -> str:
+    """
+    Assemble the response body object from per-driver JSON fragments
+    
+    Args:
+        drivers_info: Profile or error JSON keyed by driver name
+        
+    Returns:
+        JSON object text mapping each driver name to its fragment
+    """
+    return '{' + ','.join(json_dumps(name) + ':' + fragment for name, fragment in drivers_info.items()) + '}'
 
 def lambda_handler(event, context):
     """
@@ -489,145 +786,126 @@ def lambda_handler(event, context):
     try:
         logger.info("Starting driver profile lookup process")
         
-        # Get drivers from query string
-        drivers = []
-        try:
-            if 'queryStringParameters' in event and event['queryStringParameters']:
-                names_param = event['queryStringParameters'].get('names', '')
-                drivers = urllib.parse.unquote(names_param).split(',')
-                drivers = [name.strip() for name in drivers if name.strip()]
-            
-            if not drivers:
-                logger.error("No driver names provided")
-                return {
-                    'statusCode': 400,
-                    'headers': {
-                        'Content-Type': 'application/json',
-                        'Access-Control-Allow-Headers': 'Content-Type',
-                        'Access-Control-Allow-Origin': '*',
-                        'Access-Control-Allow-Methods': 'GET'
-                    },
-                    'body': json.dumps({
-                        'error': 'Bad Request',
-                        'message': 'Driver names are required in query parameter "names"'
-                    })
-                }
-                
-        except Exception as e:
-            logger.error(f"Error parsing query parameters: {e}")
+        # Get drivers from query string; API Gateway has already URL-decoded the parameter values
+        query_params = event.get('queryStringParameters') or {}
+        names_param = query_params.get('names')
+        
+        if names_param is not None and not isinstance(names_param, str):
+            logger.error("Invalid names parameter type: %s", type(names_param).__name__)
             return {
                 'statusCode': 400,
-                'headers': {
-                    'Content-Type': 'application/json',
-                    'Access-Control-Allow-Headers': 'Content-Type',
-                    'Access-Control-Allow-Origin': '*',
-                    'Access-Control-Allow-Methods': 'GET'
-                },
-                'body': json.dumps({
-                    'error': 'Bad Request',
-                    'message': 'Invalid query parameters'
-                })
+                'headers': CORS_HEADERS,
+                'body': INVALID_QUERY_BODY
             }
         
-        logger.info(f"Processing {len(drivers)} drivers: {drivers}")
+        drivers = [name for name in (part.strip() for part in (names_param or '').split(',')) if name]
+        # Repeated names share one lookup; the response is keyed by name, so it is unchanged
+        drivers = list(dict.fromkeys(drivers))
         
-        # Get OAuth credentials to determine username
-        credentials = get_oauth_credentials()
-        username = credentials['username']
+        if not drivers:
+            logger.error("No driver names provided")
+            return {
+                'statusCode': 400,
+                'headers': CORS_HEADERS,
+                'body': NAMES_REQUIRED_BODY
+            }
         
-        # Get access token
-        access_token = get_access_token(username)
+        logger.info("Processing %s drivers: %s", len(drivers), drivers)
         
-        if not access_token:
-            logger.info("No valid access token found, invoking ir_auth Lambda")
-            invoke_auth_lambda()
-            # Retry getting access token after authentication
+        with ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(drivers))) as executor:
+            # Read both caches for every driver up front; the read does not need the token,
+            # so it overlaps the Secrets Manager and ir_auth lookups below
+            prefetch_future = executor.submit(prefetch_caches, drivers)
+            
+            # Get OAuth credentials to determine username
+            credentials = get_oauth_credentials()
+            username = credentials['username']
+            
+            # Get access token
             access_token = get_access_token(username)
             
             if not access_token:
-                raise AuthenticationError("Failed to obtain access token after authentication")
+                logger.info("No valid access token found, invoking ir_auth Lambda")
+                invoke_auth_lambda()
+                # Retry getting access token after authentication
+                access_token = get_access_token(username, consistent=True)
+                
+                if not access_token:
+                    raise AuthenticationError("Failed to obtain access token after authentication")
+            
+            profile_cache, custid_cache = prefetch_future.result()
+            
+            # Resolve uncached customer IDs with parallel ir_custid batch invokes, each small enough
+            # to finish well within the ir_custid timeout; drivers a batch could not resolve fall
+            # back to the per-driver lookup in process_driver
+            custid_misses = [name for name in drivers if name not in profile_cache and name not in custid_cache]
+            custid_futures = [
+                executor.submit(invoke_custid_lambda_batch, custid_misses[start:start + CUSTID_BATCH_SIZE])
+                for start in range(0, len(custid_misses), CUSTID_BATCH_SIZE)
+            ]
+            for future in custid_futures:
+                try:
+                    custid_cache.update(future.result())
+                except APIError as e:
+                    logger.warning("Batch customer ID lookup failed, looking drivers up individually: %s", e)
+            
+            # Process drivers concurrently; each one is independent network I/O
+            fetched_profiles: Dict[str, str] = {}
+            
+            def process(name: str) -> str:
+                return process_driver(name, username, access_token,
+                                      profile_cache.get(name), custid_cache.get(name), fetched_profiles)
+            
+            drivers_info = dict(zip(drivers, executor.map(process, drivers)))
         
-        # Process each driver
-        drivers_info = {}
-        for name in drivers:
-            logger.info(f"Processing driver: {name}")
-            drivers_info[name] = process_driver(name, username, access_token)
+        # One BatchWriteItem per 25 new profiles instead of a PutItem per driver
+        if fetched_profiles:
+            cache_driver_profiles(fetched_profiles)
         
-        logger.info(f"Successfully processed {len(drivers_info)} drivers")
+        logger.info("Successfully processed %s drivers", len(drivers_info))
         
         return {
             'statusCode': 200,
-            'headers': {
-                'Content-Type': 'application/json',
-                'Access-Control-Allow-Headers': 'Content-Type',
-                'Access-Control-Allow-Origin': '*',
-                'Access-Control-Allow-Methods': 'GET'
-            },
-            'body': json.dumps(drivers_info)
+            'headers': CORS_HEADERS,
+            'body': build_drivers_body(drivers_info)
         }
         
     except AuthenticationError as e:
-        logger.error(f"Authentication error: {e}")
+        logger.error("Authentication error: %s", e)
         return {
             'statusCode': 401,
-            'headers': {
-                'Content-Type': 'application/json',
-                'Access-Control-Allow-Headers': 'Content-Type',
-                'Access-Control-Allow-Origin': '*',
-                'Access-Control-Allow-Methods': 'GET'
-            },
-            'body': json.dumps({
+            'headers': CORS_HEADERS,
+            'body': json_dumps({
                 'error': 'Authentication failed',
                 'message': str(e)
             })
         }
         
     except APIError as e:
-        logger.error(f"API error: {e}")
+        logger.error("API error: %s", e)
         return {
             'statusCode': 502,
-            'headers': {
-                'Content-Type': 'application/json',
-                'Access-Control-Allow-Headers': 'Content-Type',
-                'Access-Control-Allow-Origin': '*',
-                'Access-Control-Allow-Methods': 'GET'
-            },
-            'body': json.dumps({
+            'headers': CORS_HEADERS,
+            'body': json_dumps({
                 'error': 'API error',
                 'message': str(e)
             })
         }
         
     except ClientError as e:
-        logger.error(f"AWS service error: {e}")
+        logger.error("AWS service error: %s", e)
         return {
             'statusCode': 503,
-            'headers': {
-                'Content-Type': 'application/json',
-                'Access-Control-Allow-Headers': 'Content-Type',
-                'Access-Control-Allow-Origin': '*',
-                'Access-Control-Allow-Methods': 'GET'
-            },
-            'body': json.dumps({
-                'error': 'Service unavailable',
-                'message': 'AWS service temporarily unavailable'
-            })
+            'headers': CORS_HEADERS,
+            'body': SERVICE_UNAVAILABLE_BODY
         }
         
     except Exception as e:
-        logger.error(f"Unexpected error: {e}")
+        logger.error("Unexpected error: %s", e)
         return {
             'statusCode': 500,
-            'headers': {
-                'Content-Type': 'application/json',
-                'Access-Control-Allow-Headers': 'Content-Type',
-                'Access-Control-Allow-Origin': '*',
-                'Access-Control-Allow-Methods': 'GET'
-            },
-            'body': json.dumps({
-                'error': 'Internal server error',
-                'message': 'An unexpected error occurred'
-            })
+            'headers': CORS_HEADERS,
+            'body': INTERNAL_ERROR_BODY
         }
 
 
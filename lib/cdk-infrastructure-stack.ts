@@ -54,9 +54,13 @@ export class CdkInfrastructureStack extends cdk.Stack {
       irAuthTable: this.databaseConstruct.irAuthTable,
       irCustidTable: this.databaseConstruct.irCustidTable,
       irDriversTable: this.databaseConstruct.irDriversTable,
+      irRateLimitTable: this.databaseConstruct.irRateLimitTable,
       iracingSecret: this.secretsConstruct.iracingSecret,
       iracingSecretName: this.secretsConstruct.secretName,
       environment: environment,
+      irAuthProvisionedConcurrency: Number(this.node.tryGetContext('irAuthProvisionedConcurrency') || 0),
+      iracingRpmLimit: Number(this.node.tryGetContext('iracingRpmLimit') || 100),
+      irDriversLogLevel: this.node.tryGetContext('irDriversLogLevel'),
     });
 
     // Create API Gateway construct
@@ -139,6 +143,12 @@ export class CdkInfrastructureStack extends cdk.Stack {
       exportName: `${this.stackName}-IRDriversTableName`,
     });
 
+    new cdk.CfnOutput(this, 'IRRateLimitTableName', {
+      value: this.databaseConstruct.irRateLimitTable.tableName,
+      description: `IR Rate Limit DynamoDB table name for ${environment} environment`,
+      exportName: `${this.stackName}-IRRateLimitTableName`,
+    });
+
     // Lambda function outputs
     new cdk.CfnOutput(this, 'IRAuthFunctionName', {
       value: this.lambdaConstruct.irAuthFunction.functionName,
@@ -187,6 +197,7 @@ export class CdkInfrastructureStack extends cdk.Stack {
       irAuthTableArn: this.databaseConstruct.irAuthTable.tableArn,
       irCustidTableArn: this.databaseConstruct.irCustidTable.tableArn,
       irDriversTableArn: this.databaseConstruct.irDriversTable.tableArn,
+      irRateLimitTableArn: this.databaseConstruct.irRateLimitTable.tableArn,
       irAuthFunctionArn: this.lambdaConstruct.irAuthFunction.functionArn,
       irCustidFunctionArn: this.lambdaConstruct.irCustidFunction.functionArn,
       irDriversFunctionArn: this.lambdaConstruct.irDriversFunction.functionArn,
@@ -203,6 +214,7 @@ export class CdkInfrastructureStack extends cdk.Stack {
       irAuthTableName: this.databaseConstruct.irAuthTable.tableName,
       irCustidTableName: this.databaseConstruct.irCustidTable.tableName,
       irDriversTableName: this.databaseConstruct.irDriversTable.tableName,
+      irRateLimitTableName: this.databaseConstruct.irRateLimitTable.tableName,
       irAuthFunctionName: this.lambdaConstruct.irAuthFunction.functionName,
       irCustidFunctionName: this.lambdaConstruct.irCustidFunction.functionName,
       irDriversFunctionName: this.lambdaConstruct.irDriversFunction.functionName,
@@ -10,6 +10,7 @@ export class DatabaseConstruct extends Construct {
   public readonly irAuthTable: dynamodb.Table;
   public readonly irCustidTable: dynamodb.Table;
   public readonly irDriversTable: dynamodb.Table;
+  public readonly irRateLimitTable: dynamodb.Table;
 
   constructor(scope: Construct, id: string, props?: DatabaseConstructProps) {
     super(scope, id);
@@ -54,8 +55,21 @@ export class DatabaseConstruct extends Construct {
       removalPolicy: cdk.RemovalPolicy.RETAIN,
     });
 
+    // ir_ratelimit table for the per-minute iRacing request counters; each window's
+    // item expires on its own, so nothing here needs backups or retention
+    this.irRateLimitTable = new dynamodb.Table(this, 'IRRateLimitTable', {
+      tableName: `${prefix}ir_ratelimit`,
+      partitionKey: { 
+        name: 'window_start', 
+        type: dynamodb.AttributeType.NUMBER 
+      },
+      billingMode: dynamodb.BillingMode.PAY_PER_REQUEST,
+      timeToLiveAttribute: 'ttl',
+      removalPolicy: cdk.RemovalPolicy.DESTROY,
+    });
+
     // Add tags for better resource management
-    const tables = [this.irAuthTable, this.irCustidTable, this.irDriversTable];
+    const tables = [this.irAuthTable, this.irCustidTable, this.irDriversTable, this.irRateLimitTable];
     tables.forEach(table => {
       cdk.Tags.of(table).add('Component', 'Database');
       cdk.Tags.of(table).add('Service', 'iRacing');
@@ -9,15 +9,20 @@ export interface LambdaConstructProps {
   readonly irAuthTable: dynamodb.Table;
   readonly irCustidTable: dynamodb.Table;
   readonly irDriversTable: dynamodb.Table;
+  readonly irRateLimitTable: dynamodb.Table;
   readonly iracingSecret: secretsmanager.ISecret;
   readonly iracingSecretName: string;
   readonly environment?: string;
+  readonly irAuthProvisionedConcurrency?: number;
+  readonly iracingRpmLimit?: number;
+  readonly irDriversLogLevel?: string;
 }
 
 export class LambdaConstruct extends Construct {
   public readonly irAuthFunction: lambda.Function;
   public readonly irCustidFunction: lambda.Function;
   public readonly irDriversFunction: lambda.Function;
+  public readonly irAuthInvokeTarget: lambda.IFunction;
 
   constructor(scope: Construct, id: string, props: LambdaConstructProps) {
     super(scope, id);
@@ -32,6 +37,8 @@ export class LambdaConstruct extends Construct {
     // Common Lambda configuration - minimal to avoid circular dependencies
     const commonProps = {
       runtime: lambda.Runtime.PYTHON_3_9,
+      // Handlers are pure Python with no native code, so run them on Graviton
+      architecture: lambda.Architecture.ARM_64,
       environment: {
         REGION: cdk.Stack.of(this).region,
         ENVIRONMENT: environment,
@@ -51,6 +58,10 @@ export class LambdaConstruct extends Construct {
       timeout: cdk.Duration.seconds(30),
       description: 'iRacing OAuth 2.1 authentication handler',
       role: authRole,
+      // Serve the OAuth secret from the Parameters and Secrets extension's local cache
+      paramsAndSecrets: lambda.ParamsAndSecretsLayerVersion.fromVersion(lambda.ParamsAndSecretsVersions.V1_0_103, {
+        secretsManagerTtl: cdk.Duration.seconds(300),
+      }),
       environment: {
         ...commonProps.environment,
         IR_AUTH_TABLE_NAME: props.irAuthTable.tableName,
@@ -71,7 +82,10 @@ export class LambdaConstruct extends Construct {
         ...commonProps.environment,
         IR_AUTH_TABLE_NAME: props.irAuthTable.tableName,
         IR_CUSTID_TABLE_NAME: props.irCustidTable.tableName,
+        IR_RATELIMIT_TABLE_NAME: props.irRateLimitTable.tableName,
         IRACING_SECRET_NAME: props.iracingSecretName,
+        // Fleet-wide budget of iRacing API requests per minute shared by all ir_custid containers
+        IRACING_RPM_LIMIT: String(props.iracingRpmLimit || 100),
       },
     });
 
@@ -90,9 +104,22 @@ export class LambdaConstruct extends Construct {
         IR_CUSTID_TABLE_NAME: props.irCustidTable.tableName,
         IR_DRIVERS_TABLE_NAME: props.irDriversTable.tableName,
         IRACING_SECRET_NAME: props.iracingSecretName,
+        // WARNING drops the per-invocation progress logs, which dominate log volume in production
+        LOG_LEVEL: props.irDriversLogLevel || (environment === 'prod' ? 'WARNING' : 'INFO'),
       },
     });
 
+    // ir_auth is invoked inline by the other functions, so optionally keep pre-initialized
+    // environments ready behind a 'live' alias to take its cold start off their critical path
+    const authProvisionedConcurrency = props.irAuthProvisionedConcurrency || 0;
+    this.irAuthInvokeTarget = authProvisionedConcurrency > 0
+      ? new lambda.Alias(this, 'IRAuthLiveAlias', {
+          aliasName: 'live',
+          version: this.irAuthFunction.currentVersion,
+          provisionedConcurrentExecutions: authProvisionedConcurrency,
+        })
+      : this.irAuthFunction;
+
     // Configure permissions after all functions are created
     this.configureDynamoDBPermissions(props);
     this.configureSecretsManagerPermissions(props);
@@ -143,6 +170,7 @@ export class LambdaConstruct extends Construct {
     // ir_custid function needs:
     // - Read access to ir_auth table (for token lookup)
     // - Read/write access to ir_custid table (for caching)
+    // - Update access to ir_ratelimit table (for the shared request budget)
     const custidAuthTableReadPolicy = new iam.PolicyStatement({
       effect: iam.Effect.ALLOW,
       actions: [
@@ -177,8 +205,16 @@ export class LambdaConstruct extends Construct {
       resources: [props.irCustidTable.tableArn, `${props.irCustidTable.tableArn}/index/*`]
     });
 
+    const custidRateLimitTablePolicy = new iam.PolicyStatement({
+      effect: iam.Effect.ALLOW,
+      actions: [
+        'dynamodb:UpdateItem'
+      ],
+      resources: [props.irRateLimitTable.tableArn]
+    });
+
     this.irCustidFunction.role?.attachInlinePolicy(new iam.Policy(this, 'CustidTablePolicy', {
-      statements: [custidAuthTableReadPolicy, custidTablePolicy]
+      statements: [custidAuthTableReadPolicy, custidTablePolicy, custidRateLimitTablePolicy]
     }));
 
     // ir_drivers function needs:
@@ -269,7 +305,7 @@ export class LambdaConstruct extends Construct {
     const custidInvokeAuthPolicy = new iam.PolicyStatement({
       effect: iam.Effect.ALLOW,
       actions: ['lambda:InvokeFunction'],
-      resources: [this.irAuthFunction.functionArn],
+      resources: [this.irAuthInvokeTarget.functionArn],
     });
     this.irCustidFunction.role?.attachInlinePolicy(new iam.Policy(this, 'CustidInvokeAuthPolicy', {
       statements: [custidInvokeAuthPolicy]
@@ -279,7 +315,7 @@ export class LambdaConstruct extends Construct {
     const driversInvokeAuthPolicy = new iam.PolicyStatement({
       effect: iam.Effect.ALLOW,
       actions: ['lambda:InvokeFunction'],
-      resources: [this.irAuthFunction.functionArn],
+      resources: [this.irAuthInvokeTarget.functionArn],
     });
     const driversInvokeCustidPolicy = new iam.PolicyStatement({
       effect: iam.Effect.ALLOW,
@@ -295,8 +331,8 @@ export class LambdaConstruct extends Construct {
     // Add function ARNs to environment variables for inter-Lambda invocation
     // This is done after all functions are created to avoid circular dependencies
     
-    this.irCustidFunction.addEnvironment('IR_AUTH_FUNCTION_ARN', this.irAuthFunction.functionArn);
-    this.irDriversFunction.addEnvironment('IR_AUTH_FUNCTION_ARN', this.irAuthFunction.functionArn);
+    this.irCustidFunction.addEnvironment('IR_AUTH_FUNCTION_ARN', this.irAuthInvokeTarget.functionArn);
+    this.irDriversFunction.addEnvironment('IR_AUTH_FUNCTION_ARN', this.irAuthInvokeTarget.functionArn);
     this.irDriversFunction.addEnvironment('IR_CUSTID_FUNCTION_ARN', this.irCustidFunction.functionArn);
   }
 
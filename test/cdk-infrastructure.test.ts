@@ -53,6 +53,16 @@ describe('CDK Infrastructure Stack', () => {
         PointInTimeRecoveryEnabled: true,
       },
     });
+
+    // ir_ratelimit table
+    template.hasResourceProperties('AWS::DynamoDB::Table', {
+      TableName: 'dev-iracing-forum-browser-addon-drivers-stats-ir_ratelimit',
+      BillingMode: 'PAY_PER_REQUEST',
+      TimeToLiveSpecification: {
+        AttributeName: 'ttl',
+        Enabled: true,
+      },
+    });
   });
 
   test('Creates Lambda functions with correct configuration', () => {
@@ -62,6 +72,7 @@ describe('CDK Infrastructure Stack', () => {
       MemorySize: 256,
       Timeout: 30,
       Description: 'iRacing OAuth 2.1 authentication handler',
+      Architectures: ['arm64'],
     });
 
     // ir_custid Lambda
@@ -70,6 +81,12 @@ describe('CDK Infrastructure Stack', () => {
       MemorySize: 256,
       Timeout: 60,
       Description: 'iRacing customer ID lookup handler',
+      Architectures: ['arm64'],
+      Environment: {
+        Variables: {
+          IRACING_RPM_LIMIT: '100',
+        },
+      },
     });
 
     // ir_drivers Lambda
@@ -78,6 +95,27 @@ describe('CDK Infrastructure Stack', () => {
       MemorySize: 512,
       Timeout: 300,
       Description: 'iRacing driver profile lookup handler',
+      Architectures: ['arm64'],
+      Environment: {
+        Variables: {
+          LOG_LEVEL: 'INFO',
+        },
+      },
+    });
+  });
+
+  test('Only provisions ir_auth concurrency when requested', () => {
+    template.resourceCountIs('AWS::Lambda::Alias', 0);
+
+    const app = new cdk.App({ context: { irAuthProvisionedConcurrency: '1' } });
+    const stack = new CdkInfrastructure.CdkInfrastructureStack(app, 'ProvisionedTestStack');
+    const provisionedTemplate = Template.fromStack(stack);
+
+    provisionedTemplate.hasResourceProperties('AWS::Lambda::Alias', {
+      Name: 'live',
+      ProvisionedConcurrencyConfig: {
+        ProvisionedConcurrentExecutions: 1,
+      },
     });
   });
 
@@ -147,7 +185,7 @@ describe('CDK Infrastructure Stack', () => {
 
   test('Has proper resource tagging', () => {
     // Check that DynamoDB tables have tags (but don't check exact tag structure since it varies)
-    template.resourceCountIs('AWS::DynamoDB::Table', 3);
+    template.resourceCountIs('AWS::DynamoDB::Table', 4);
     
     // Verify that tables have some form of tagging
     const tables = template.findResources('AWS::DynamoDB::Table');
@@ -0,0 +1,84 @@
+"""
+Shared fixtures for the Lambda handler tests
+
+Each function directory ships its own lambda_function module, so the modules are
+loaded from their paths under distinct names, fresh for every test, to keep their
+warm-container caches from leaking between tests.
+"""
+import importlib.util
+import io
+import json
+import os
+from pathlib import Path
+
+import pytest
+from botocore.exceptions import ClientError
+
+LAMBDA_ROOT = Path(__file__).resolve().parents[2] / 'lambda'
+
+# Clients are created at import time and only need a region; no request leaves the fakes
+os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+
+
+def load_lambda(name):
+    spec = importlib.util.spec_from_file_location(f'{name}_lambda_function',
+                                                  LAMBDA_ROOT / name / 'lambda_function.py')
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def client_error(code, operation='UpdateItem'):
+    return ClientError({'Error': {'Code': code, 'Message': code}}, operation)
+
+
+def invoke_response(status_code, body):
+    """Build a Lambda invoke response wrapping an API Gateway style result"""
+    payload = json.dumps({'statusCode': status_code, 'body': json.dumps(body)}).encode()
+    return {'StatusCode': 200, 'Payload': io.BytesIO(payload)}
+
+
+class FakeClient:
+    """
+    Records every call and dispatches it to a handler set per test
+
+    Operations without a handler return an empty response.
+    """
+
+    def __init__(self, **handlers):
+        self.calls = []
+        self.handlers = handlers
+
+    def __getattr__(self, operation):
+        if operation.startswith('_'):
+            raise AttributeError(operation)
+
+        def call(**kwargs):
+            self.calls.append((operation, kwargs))
+            handler = self.handlers.get(operation)
+            return handler(**kwargs) if handler else {}
+        return call
+
+    def operations(self):
+        return [operation for operation, _ in self.calls]
+
+
+@pytest.fixture
+def ir_auth(monkeypatch):
+    module = load_lambda('ir_auth')
+    monkeypatch.setattr(module.time, 'sleep', lambda seconds: None)
+    return module
+
+
+@pytest.fixture
+def ir_custid(monkeypatch):
+    module = load_lambda('ir_custid')
+    monkeypatch.setattr(module.time, 'sleep', lambda seconds: None)
+    return module
+
+
+@pytest.fixture
+def ir_drivers(monkeypatch):
+    module = load_lambda('ir_drivers')
+    monkeypatch.setattr(module.time, 'sleep', lambda seconds: None)
+    return module
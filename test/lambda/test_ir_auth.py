@@ -0,0 +1,161 @@
+import io
+import json
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from conftest import FakeClient, client_error
+
+CREDENTIALS = {'client_id': 'cid', 'client_secret': 'secret', 'username': 'owner@example.com', 'password': 'pw'}
+
+
+@pytest.fixture
+def dynamodb(ir_auth):
+    client = FakeClient()
+    ir_auth.dynamodb = client
+    ir_auth.get_oauth_credentials = lambda: CREDENTIALS
+    return client
+
+
+def serve_secret(ir_auth, monkeypatch):
+    """Answer the extension's loopback request with CREDENTIALS, counting the reads"""
+    reads = []
+
+    def urlopen(request, timeout):
+        reads.append(request.full_url)
+        return io.BytesIO(json.dumps({'SecretString': json.dumps(CREDENTIALS)}).encode())
+    monkeypatch.setattr(ir_auth.urllib.request, 'urlopen', urlopen)
+    return reads
+
+
+def test_credentials_are_reloaded_once_the_cache_expires(ir_auth, monkeypatch):
+    reads = serve_secret(ir_auth, monkeypatch)
+    clock = [1000.0]
+    monkeypatch.setattr(ir_auth.time, 'monotonic', lambda: clock[0])
+
+    ir_auth.get_oauth_credentials()
+    ir_auth.get_oauth_credentials()
+    assert len(reads) == 1
+
+    clock[0] += ir_auth.CREDENTIALS_CACHE_TTL
+    assert ir_auth.get_oauth_credentials()['username'] == 'owner@example.com'
+    assert len(reads) == 2
+
+
+def test_rejected_credentials_are_dropped_from_the_cache(ir_auth, monkeypatch):
+    reads = serve_secret(ir_auth, monkeypatch)
+    credentials = ir_auth.get_oauth_credentials()
+    rejected = SimpleNamespace(status=401, data=b'', headers={})
+    ir_auth.http_pool = SimpleNamespace(request=lambda method, url, body, headers: rejected)
+
+    with pytest.raises(ir_auth.AuthenticationError):
+        ir_auth.make_oauth_request(credentials, 'password_limited')
+
+    ir_auth.get_oauth_credentials()
+    assert len(reads) == 2
+
+
+def store(ir_auth, oauth_response):
+    token = ir_auth.project_token(oauth_response)
+    return ir_auth.store_tokens_in_dynamodb('owner@example.com', oauth_response, token, int(time.time()) + 600)
+
+
+def test_store_tokens_is_conditional_on_no_valid_token(ir_auth, dynamodb):
+    assert store(ir_auth, {'access_token': 'a', 'refresh_token': 'r'}) is True
+
+    request = dynamodb.calls[0][1]
+    assert request['ConditionExpression'] == 'attribute_not_exists(#ttl) OR #ttl < :cutoff'
+    assert request['ExpressionAttributeValues'][':refresh_token'] == {'S': 'r'}
+    assert 'REMOVE' not in request['UpdateExpression']
+
+
+def test_store_tokens_removes_refresh_token_missing_from_response(ir_auth, dynamodb):
+    store(ir_auth, {'access_token': 'a'})
+
+    request = dynamodb.calls[0][1]
+    removed = request['UpdateExpression'].split(' REMOVE ')[1].split(', ')
+    assert removed == ['#refresh_token', '#refresh_token_expires_in', '#refresh_token_ttl']
+    assert request['ExpressionAttributeNames']['#refresh_token_ttl'] == 'refresh_token_ttl'
+
+
+def test_store_tokens_keeps_a_valid_stored_token(ir_auth, dynamodb):
+    def update_item(**kwargs):
+        raise client_error('ConditionalCheckFailedException')
+    dynamodb.handlers['update_item'] = update_item
+
+    assert store(ir_auth, {'access_token': 'a'}) is False
+
+
+def test_store_tokens_raises_other_dynamodb_errors(ir_auth, dynamodb):
+    def update_item(**kwargs):
+        raise client_error('ProvisionedThroughputExceededException')
+    dynamodb.handlers['update_item'] = update_item
+
+    with pytest.raises(ir_auth.ClientError):
+        store(ir_auth, {'access_token': 'a'})
+
+
+def test_losing_a_store_race_reads_the_winner_consistently(ir_auth, dynamodb):
+    def update_item(**kwargs):
+        raise client_error('ConditionalCheckFailedException')
+    dynamodb.handlers['update_item'] = update_item
+    dynamodb.handlers['get_item'] = lambda **kwargs: {'Item': {
+        'access_token': {'S': 'winner'}, 'ttl': {'N': str(int(time.time()) + 600)}
+    }}
+    ir_auth.make_oauth_request = lambda credentials, grant_type, refresh_token=None, deadline=None: {
+        'access_token': 'loser'
+    }
+
+    token, message = ir_auth.authenticate(CREDENTIALS, 'owner@example.com', None)
+
+    assert token['access_token'] == 'winner'
+    assert message == 'Authentication successful (cached)'
+    assert dynamodb.operations() == ['update_item', 'get_item']
+    assert dynamodb.calls[-1][1]['ConsistentRead'] is True
+
+
+def batch_refresh(ir_auth, usernames):
+    ir_auth.request_user_tokens = lambda credentials, username, existing, deadline: {
+        'access_token': 'new-' + username, 'expires_in': 600, 'refresh_token': 'rotated-' + username
+    }
+    response = ir_auth.lambda_handler({'usernames': usernames}, None)
+    return response['statusCode'], json.loads(response['body'])
+
+
+def test_batch_event_is_dispatched_to_batch_handler(ir_auth, dynamodb):
+    status, body = batch_refresh(ir_auth, ['owner@example.com', 'other', 'other'])
+
+    assert status == 200
+    assert body['refreshed'] == ['owner@example.com', 'other']
+    written = dynamodb.calls[-1][1]['RequestItems']['ir_auth']
+    assert [request['PutRequest']['Item']['username']['S'] for request in written] == ['owner@example.com', 'other']
+
+
+def test_batch_writes_unprocessed_tokens_individually(ir_auth, dynamodb):
+    dynamodb.handlers['batch_write_item'] = lambda RequestItems: {'UnprocessedItems': RequestItems}
+
+    status, body = batch_refresh(ir_auth, ['owner@example.com', 'other'])
+
+    assert status == 200
+    assert body['refreshed'] == ['owner@example.com', 'other']
+    assert dynamodb.operations().count('batch_write_item') == ir_auth.BATCH_MAX_RETRIES
+    puts = [kwargs['Item'] for operation, kwargs in dynamodb.calls if operation == 'put_item']
+    assert [item['refresh_token']['S'] for item in puts] == ['rotated-owner@example.com', 'rotated-other']
+
+
+def test_batch_reports_tokens_that_could_not_be_stored(ir_auth, dynamodb):
+    def batch_write_item(RequestItems):
+        raise client_error('ProvisionedThroughputExceededException', 'BatchWriteItem')
+
+    def put_item(TableName, Item):
+        if Item['username']['S'] == 'other':
+            raise client_error('ProvisionedThroughputExceededException', 'PutItem')
+        return {}
+    dynamodb.handlers.update(batch_write_item=batch_write_item, put_item=put_item)
+
+    status, body = batch_refresh(ir_auth, ['owner@example.com', 'other'])
+
+    assert status == 200
+    assert body['refreshed'] == ['owner@example.com']
+    assert list(body['failed']) == ['other']
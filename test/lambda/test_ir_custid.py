@@ -0,0 +1,160 @@
+import json
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from conftest import FakeClient, client_error, invoke_response
+
+
+@pytest.fixture
+def dynamodb(ir_custid):
+    client = FakeClient()
+    ir_custid.dynamodb = client
+    return client
+
+
+def test_rate_limit_slot_costs_one_conditional_write(ir_custid, dynamodb):
+    assert ir_custid.acquire_rate_limit_slot() is True
+
+    assert dynamodb.operations() == ['update_item']
+    request = dynamodb.calls[0][1]
+    window_start = int(request['Key']['window_start']['N'])
+    assert request['TableName'] == 'ir_ratelimit'
+    assert window_start % ir_custid.RATE_LIMIT_WINDOW == 0
+    assert request['ConditionExpression'] == 'attribute_not_exists(request_count) OR request_count < :limit'
+    assert request['ExpressionAttributeValues'][':limit'] == {'N': str(ir_custid.IRACING_RPM_LIMIT)}
+    assert int(request['ExpressionAttributeValues'][':expires']['N']) > window_start + ir_custid.RATE_LIMIT_WINDOW
+
+
+def test_rate_limit_slot_refused_once_budget_is_spent(ir_custid, dynamodb):
+    def update_item(**kwargs):
+        raise client_error('ConditionalCheckFailedException')
+    dynamodb.handlers['update_item'] = update_item
+
+    assert ir_custid.acquire_rate_limit_slot() is False
+
+
+def test_rate_limit_slot_fails_open_on_dynamodb_errors(ir_custid, dynamodb):
+    def update_item(**kwargs):
+        raise client_error('ProvisionedThroughputExceededException')
+    dynamodb.handlers['update_item'] = update_item
+
+    assert ir_custid.acquire_rate_limit_slot() is True
+
+
+def test_every_search_attempt_takes_a_rate_limit_slot(ir_custid, dynamodb, monkeypatch):
+    slots = iter([True, True, False])
+    monkeypatch.setattr(ir_custid, 'acquire_rate_limit_slot', lambda: next(slots))
+    monkeypatch.setattr(ir_custid, 'cache_search_link', lambda search_term, link: None)
+    statuses = iter([503, 200])
+
+    def request(method, url, headers):
+        if 'search_term' in url:
+            return SimpleNamespace(status=next(statuses), data=b'{"link": "https://s3/result"}', headers={})
+        return SimpleNamespace(status=503, data=b'', headers={})
+    ir_custid.http_pool = SimpleNamespace(request=request)
+
+    # Two slots cover the failed search attempt and its retry; the S3 retries take none
+    with pytest.raises(ir_custid.APIError):
+        ir_custid.search_driver_with_auth('Alice', 'token')
+
+    with pytest.raises(ir_custid.RateLimitError):
+        ir_custid.search_driver_with_auth('Alice', 'token')
+
+
+def custid_items(**cust_ids):
+    return {name: {'name': {'S': name}, 'cust_id': {'N': cust_id}} for name, cust_id in cust_ids.items()}
+
+
+def test_batch_cache_hits_need_no_credentials(ir_custid, dynamodb, monkeypatch):
+    dynamodb.handlers['batch_get_item'] = lambda RequestItems: {
+        'Responses': {'ir_custid': list(custid_items(Alice='1', Bob='2').values())}
+    }
+
+    def no_credentials():
+        raise AssertionError('credentials loaded for a cache hit')
+    monkeypatch.setattr(ir_custid, 'get_oauth_credentials', no_credentials)
+
+    response = ir_custid.lambda_handler({'names': ['Alice', 'Bob', 'Alice']}, None)
+
+    assert response['statusCode'] == 200
+    assert json.loads(response['body']) == {'Alice': '1', 'Bob': '2'}
+    assert list(dynamodb.calls[0][1]['RequestItems']) == ['ir_custid']
+
+
+def warm_credentials(ir_custid):
+    ir_custid._CREDS_CACHE.update(value={'username': 'owner@example.com'}, expires=float('inf'))
+
+
+def auth_item(ir_custid):
+    return {'access_token': {'S': 'stored'}, 'ttl': {'N': str(int(ir_custid.time.time()) + 600)}}
+
+
+def test_warm_lookup_reads_token_with_the_cache_item(ir_custid, dynamodb, monkeypatch):
+    warm_credentials(ir_custid)
+    dynamodb.handlers['batch_get_item'] = lambda RequestItems: {'Responses': {'ir_auth': [auth_item(ir_custid)]}}
+    monkeypatch.setattr(ir_custid, 'prewarm_api_connection', lambda: None)
+    monkeypatch.setattr(ir_custid, 'lookup_driver_single_flight',
+                        lambda search_term, username, custid_item, access_token: {'custid': access_token})
+
+    response = ir_custid.lambda_handler({'rawQueryString': 'Alice'}, None)
+
+    assert json.loads(response['body']) == {'custid': 'stored'}
+    assert dynamodb.operations() == ['batch_get_item']
+    assert sorted(dynamodb.calls[0][1]['RequestItems']) == ['ir_auth', 'ir_custid']
+
+
+def test_cold_lookup_reads_token_only_on_a_miss(ir_custid, dynamodb, monkeypatch):
+    monkeypatch.setattr(ir_custid, 'get_oauth_credentials', lambda: {'username': 'owner@example.com'})
+    monkeypatch.setattr(ir_custid, 'prewarm_api_connection', lambda: None)
+    monkeypatch.setattr(ir_custid, 'lookup_driver_single_flight',
+                        lambda search_term, username, custid_item, access_token: {'custid': '7'})
+
+    ir_custid.lambda_handler({'rawQueryString': 'Alice'}, None)
+
+    assert [kwargs['TableName'] for _, kwargs in dynamodb.calls] == ['ir_custid', 'ir_auth']
+
+
+def test_warm_batch_reads_token_with_the_first_cache_request(ir_custid, dynamodb, monkeypatch):
+    warm_credentials(ir_custid)
+    dynamodb.handlers['batch_get_item'] = lambda RequestItems: {'Responses': {'ir_auth': [auth_item(ir_custid)]}}
+    monkeypatch.setattr(ir_custid, 'prewarm_api_connection', lambda: None)
+    monkeypatch.setattr(ir_custid, 'lookup_driver_single_flight',
+                        lambda search_term, username, custid_item, access_token: {'custid': access_token})
+
+    response = ir_custid.lambda_handler({'names': ['Alice', 'Bob']}, None)
+
+    assert json.loads(response['body']) == {'Alice': 'stored', 'Bob': 'stored'}
+    assert dynamodb.operations() == ['batch_get_item']
+    assert dynamodb.calls[0][1]['RequestItems']['ir_auth']['Keys'] == [{'username': {'S': 'owner@example.com'}}]
+
+
+def test_batch_misses_share_one_token_refresh(ir_custid, dynamodb, monkeypatch):
+    monkeypatch.setattr(ir_custid, 'get_oauth_credentials', lambda: {'username': 'owner@example.com'})
+    monkeypatch.setattr(ir_custid, 'prewarm_api_connection', lambda: None)
+
+    def invoke(**kwargs):
+        # Hold the refresh long enough for every lookup thread to need a token
+        threading.Event().wait(0.05)
+        return invoke_response(200, {'access_token': 'fresh'})
+    ir_custid.lambda_client = FakeClient(invoke=invoke)
+
+    def search(search_term, access_token, cached_link=None):
+        assert access_token == 'fresh'
+        if search_term == 'Broken':
+            raise ir_custid.APIError('Search request failed: 500')
+        return {'custid': '0' if search_term == 'Ghost' else '7'}
+    monkeypatch.setattr(ir_custid, 'search_driver_with_auth', search)
+
+    response = ir_custid.lambda_handler({'names': ['A', 'B', 'C', 'Ghost', 'Broken']}, None)
+
+    assert json.loads(response['body']) == {'A': '7', 'B': '7', 'C': '7', 'Ghost': '0'}
+    assert ir_custid.lambda_client.operations() == ['invoke']
+
+
+def test_not_found_driver_is_a_string_id(ir_custid, dynamodb, monkeypatch):
+    monkeypatch.setattr(ir_custid, 'request_with_retries', lambda url, headers, description, max_attempts=3, acquire=None:
+                        {'link': 'https://s3/result'} if 'search_term' in url else [])
+
+    assert ir_custid.search_driver_with_auth('Nobody', 'token')['custid'] == '0'
@@ -0,0 +1,47 @@
+import json
+import zlib
+
+from conftest import FakeClient, invoke_response, load_lambda
+
+
+def profile_item(text, ttl):
+    return {'name': {'S': 'Driver'}, 'profile_z': {'B': zlib.compress(text)}, 'ttl': {'N': str(ttl)}}
+
+
+def test_cached_profile_is_returned_as_stored(ir_drivers):
+    assert ir_drivers.parse_cached_profile('Driver', profile_item(b'{"member": 1}', 200), 100) == '{"member": 1}'
+
+
+def test_corrupt_cached_profile_is_a_miss(ir_drivers):
+    assert ir_drivers.parse_cached_profile('Driver', profile_item(b'{"member": ', 200), 100) is None
+    assert ir_drivers.parse_cached_profile('Driver', profile_item(b'\xff\xfe', 200), 100) is None
+
+
+def test_expired_cached_profile_is_a_miss(ir_drivers):
+    assert ir_drivers.parse_cached_profile('Driver', profile_item(b'{}', 100), 100) is None
+
+
+def test_single_and_batch_custid_invokes_resolve_the_same_name(ir_drivers, monkeypatch):
+    name = 'Team %41 Racing'
+    ir_custid = load_lambda('ir_custid')
+    monkeypatch.setattr(ir_custid, 'get_cached_custid', lambda search_term: {'cust_id': {'N': '1'}} if search_term == name else None)
+    monkeypatch.setattr(ir_custid, 'get_cached_custids', lambda search_terms, username=None: (
+        {name: {'cust_id': {'N': '1'}}} if search_terms == [name] else {}, None))
+
+    def invoke(FunctionName, InvocationType, Payload):
+        response = ir_custid.lambda_handler(json.loads(Payload), None)
+        return invoke_response(response['statusCode'], json.loads(response['body']))
+    ir_drivers.lambda_client = FakeClient(invoke=invoke)
+
+    assert ir_drivers.invoke_custid_lambda(name) == '1'
+    assert ir_drivers.invoke_custid_lambda_batch([name]) == {name: '1'}
+
+
+def test_unknown_log_level_falls_back_to_info(monkeypatch):
+    monkeypatch.setenv('LOG_LEVEL', 'verbose')
+    module = load_lambda('ir_drivers')
+    assert module.logger.level == module.logging.INFO
+
+    monkeypatch.setenv('LOG_LEVEL', 'warning')
+    module = load_lambda('ir_drivers')
+    assert module.logger.level == module.logging.WARNING